@@ -0,0 +1 @@
+# 快取模組
\ No newline at end of file
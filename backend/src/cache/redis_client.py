@@ -0,0 +1,138 @@
+"""
+T059: Redis 快取連線配置
+Redis 連線管理和 JSON 快取操作
+"""
+import os
+import json
+import logging
+import threading
+import time
+from typing import Any, Optional, Union
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Redis 配置
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "32"))
+# 使用 NullRedis 期間重新連線的等待秒數，每次失敗加倍直到上限
+REDIS_RECONNECT_MIN_DELAY = float(os.getenv("REDIS_RECONNECT_MIN_DELAY", "1"))
+REDIS_RECONNECT_MAX_DELAY = float(os.getenv("REDIS_RECONNECT_MAX_DELAY", "60"))
+
+
+class RedisClient:
+    """Redis 客戶端包裝"""
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        # from_url 不會立即連線，第一次操作時才建立連線
+        self.client = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.connected = False
+
+    def connect(self) -> bool:
+        """建立連線並確認 Redis 可用"""
+        try:
+            self.client.ping()
+            self.connected = True
+        except redis.RedisError as e:
+            logger.warning(f"Redis 連線失敗: {e}")
+            self.connected = False
+        return self.connected
+
+    def set(self, key: str, value: Any, expiry: Optional[int] = None) -> bool:
+        """以 JSON 格式儲存資料"""
+        try:
+            return bool(self.client.set(key, json.dumps(value, default=str), ex=expiry))
+        except redis.RedisError as e:
+            logger.error(f"Redis 寫入失敗 ({key}): {e}")
+            return False
+
+    def get(self, key: str) -> Optional[Any]:
+        """讀取 JSON 格式資料"""
+        try:
+            data = self.client.get(key)
+            return json.loads(data) if data is not None else None
+        except (redis.RedisError, ValueError) as e:
+            logger.error(f"Redis 讀取失敗 ({key}): {e}")
+            return None
+
+    def delete(self, *keys: str) -> int:
+        """刪除資料"""
+        if not keys:
+            return 0
+        try:
+            return self.client.delete(*keys)
+        except redis.RedisError as e:
+            logger.error(f"Redis 刪除失敗 ({', '.join(keys)}): {e}")
+            return 0
+
+
+class NullRedis:
+    """Redis 無法使用時的替代物件，所有操作皆為 no-op"""
+
+    connected = False
+
+    def set(self, key: str, value: Any, expiry: Optional[int] = None) -> bool:
+        return False
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def delete(self, *keys: str) -> int:
+        return 0
+
+
+# 全域 Redis 客戶端實例
+redis_client = RedisClient()
+null_redis = NullRedis()
+
+# 連線成功前一律使用 NullRedis，呼叫端不需再檢查連線狀態
+_active_client: Union[RedisClient, NullRedis] = null_redis
+# 下一次允許重新連線的時間（time.monotonic()）與目前的退避秒數
+_next_reconnect_at = 0.0
+_reconnect_delay = REDIS_RECONNECT_MIN_DELAY
+# 同一時間只讓一個請求嘗試重新連線，其他請求直接使用 NullRedis
+_reconnect_lock = threading.Lock()
+
+
+def connect_redis() -> bool:
+    """連線 Redis，失敗時 get_redis() 改回傳 NullRedis，並在退避時間後重試"""
+    global _active_client, _next_reconnect_at, _reconnect_delay
+    if redis_client.connect():
+        _active_client = redis_client
+        _reconnect_delay = REDIS_RECONNECT_MIN_DELAY
+    else:
+        _active_client = null_redis
+        logger.warning(f"Redis 無法使用，改用 NullRedis，{_reconnect_delay:g} 秒後重新連線")
+        _next_reconnect_at = time.monotonic() + _reconnect_delay
+        _reconnect_delay = min(_reconnect_delay * 2, REDIS_RECONNECT_MAX_DELAY)
+    return redis_client.connected
+
+
+def get_redis() -> Union[RedisClient, NullRedis]:
+    """取得 Redis 客戶端依賴注入（使用 NullRedis 期間依退避時間重新連線）"""
+    if _active_client is null_redis and time.monotonic() >= _next_reconnect_at:
+        if _reconnect_lock.acquire(blocking=False):
+            try:
+                if _active_client is null_redis and connect_redis():
+                    logger.info("Redis 已重新連線")
+            finally:
+                _reconnect_lock.release()
+    return _active_client
+
+
+# 全域非同步 Redis 客戶端（共用連線池，操作不會阻塞事件循環）
+async_redis_client = aioredis.Redis(
+    connection_pool=aioredis.ConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        decode_responses=True
+    )
+)
+
+
+def get_async_redis() -> aioredis.Redis:
+    """取得非同步 Redis 客戶端依賴注入"""
+    return async_redis_client
@@ -0,0 +1,45 @@
+"""
+行程內 TTL 快取
+用於在 Redis 前緩存短時間內不會變動的資料
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+class TTLCache:
+    """有存活時間與容量上限的 LRU 快取"""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock  # 可注入時鐘，測試時不必真的等待過期
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """讀取快取，不存在或已過期時返回 None"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if self._clock() >= expires_at:
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """寫入快取，超過容量時淘汰最久未使用的項目"""
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        """移除快取項目"""
+        self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
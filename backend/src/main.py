@@ -12,7 +12,7 @@ from .api.v1.question_sets import initialize_question_set_manager, shutdown_ques
 from .middleware.logging import LoggingMiddleware
 from .middleware.error import ErrorHandlerMiddleware
 from .database.connection import create_tables
-from .cache.redis_client import get_redis
+from .cache.redis_client import connect_redis
 
 # 設定日誌
 logging.basicConfig(level=logging.INFO)
@@ -31,8 +31,7 @@ async def lifespan(app: FastAPI):
         logger.info("資料庫表格已建立")
 
         # 初始化 Redis 連線
-        redis_client = get_redis()
-        if redis_client.connect():
+        if connect_redis():
             logger.info("Redis 連線已建立")
         else:
             logger.warning("Redis 連線失敗，將繼續使用檔案系統")
@@ -4,7 +4,7 @@ T028: QuestionSetData 資料類別
 """
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class VerificationStep(BaseModel):
@@ -15,6 +15,8 @@ class VerificationStep(BaseModel):
     expectedOutput: str  # 期望輸出
     weightage: int  # 權重分數
 
+    model_config = ConfigDict(frozen=True)  # 載入後唯讀
+
 
 class QuestionData(BaseModel):
     """題目資料模型"""
@@ -24,6 +26,8 @@ class QuestionData(BaseModel):
     notes: str  # 注意事項
     verification: List[VerificationStep]  # 驗證步驟列表
 
+    model_config = ConfigDict(frozen=True)  # 載入後唯讀
+
 
 class QuestionSetMetadata(BaseModel):
     """題組元資料模型"""
@@ -40,6 +44,8 @@ class QuestionSetMetadata(BaseModel):
     version: Optional[str] = None
     tags: List[str] = []
 
+    model_config = ConfigDict(frozen=True)  # 載入後唯讀
+
 
 class QuestionSetData(BaseModel):
     """題組完整資料模型"""
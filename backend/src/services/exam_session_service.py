@@ -5,7 +5,8 @@ T031: ExamSessionService 考試會話管理
 import json
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -18,37 +19,43 @@ from ..models.exam_session import (
     ExamSessionDetailed
 )
 from ..models.question_set_data import QuestionSetData
-from ..cache.redis_client import RedisClient
+from ..cache.redis_client import RedisClient, null_redis
 
 
 class ExamSessionService:
     """考試會話管理服務"""
 
-    def __init__(self, db: Session, redis_client: RedisClient = None, question_set_manager=None):
+    def __init__(self, db: Session, redis_client: RedisClient = None, question_set_manager=None,
+                 clock: Callable[[], datetime] = datetime.utcnow):
         self.db = db
-        self.redis = redis_client
+        # 目前時間來源，測試可注入固定時間
+        self.clock = clock
+        # 未提供 Redis 時使用 NullRedis，快取操作直接略過
+        self.redis = redis_client if redis_client is not None else null_redis
         self.question_set_manager = question_set_manager
 
     async def list_sessions(self, status_filter: Optional[str] = None) -> List[ExamSessionResponse]:
         """列出考試會話"""
-        query = self.db.query(ExamSession)
+        stmt = select(ExamSession)
 
         if status_filter:
-            query = query.filter(ExamSession.status == status_filter)
+            stmt = stmt.where(ExamSession.status == status_filter)
 
-        sessions = query.order_by(ExamSession.created_at.desc()).all()
+        sessions = self.db.execute(stmt.order_by(ExamSession.created_at.desc())).scalars().all()
         return [self._to_response_model(session) for session in sessions]
 
     async def create_session(self, session_request: ExamSessionCreate) -> ExamSessionResponse:
         """建立新的考試會話"""
         try:
             # 檢查是否有正在進行的會話
-            active_session = self.db.query(ExamSession).filter(
-                ExamSession.status.in_([
+            active_session = self.db.execute(
+                select(ExamSession)
+                .where(ExamSession.status.in_([
                     ExamSessionStatus.IN_PROGRESS,
                     ExamSessionStatus.PAUSED
-                ])
-            ).first()
+                ]))
+                .limit(1)
+            ).scalar_one_or_none()
 
             if active_session:
                 raise ValueError("已有正在進行的考試會話，請先完成或取消現有會話")
@@ -81,8 +88,7 @@ class ExamSessionService:
             self.db.refresh(db_session)
 
             # 快取會話狀態
-            if self.redis:
-                await self._cache_session_state(db_session)
+            await self._cache_session_state(db_session)
 
             return self._to_response_model(db_session)
 
@@ -95,9 +101,7 @@ class ExamSessionService:
 
     async def get_session(self, session_id: str) -> Optional[ExamSessionDetailed]:
         """取得考試會話詳細資訊"""
-        db_session = self.db.query(ExamSession).filter(
-            ExamSession.id == session_id
-        ).first()
+        db_session = self._find_session(session_id)
 
         if not db_session:
             return None
@@ -113,7 +117,7 @@ class ExamSessionService:
         time_elapsed_minutes = 0
         if db_session.start_time:
             if db_session.status == ExamSessionStatus.IN_PROGRESS:
-                time_elapsed_minutes = (datetime.utcnow() - db_session.start_time).total_seconds() / 60
+                time_elapsed_minutes = (self.clock() - db_session.start_time).total_seconds() / 60
             elif db_session.end_time:
                 time_elapsed_minutes = (db_session.end_time - db_session.start_time).total_seconds() / 60
 
@@ -133,9 +137,7 @@ class ExamSessionService:
 
     async def update_session(self, session_id: str, update_request: ExamSessionUpdate) -> Optional[ExamSessionResponse]:
         """更新考試會話"""
-        db_session = self.db.query(ExamSession).filter(
-            ExamSession.id == session_id
-        ).first()
+        db_session = self._find_session(session_id)
 
         if not db_session:
             return None
@@ -155,8 +157,7 @@ class ExamSessionService:
             self.db.refresh(db_session)
 
             # 更新快取
-            if self.redis:
-                await self._cache_session_state(db_session)
+            await self._cache_session_state(db_session)
 
             return self._to_response_model(db_session)
 
@@ -166,9 +167,7 @@ class ExamSessionService:
 
     async def start_session(self, session_id: str) -> ExamSessionResponse:
         """開始考試會話"""
-        db_session = self.db.query(ExamSession).filter(
-            ExamSession.id == session_id
-        ).first()
+        db_session = self._find_session(session_id)
 
         if not db_session:
             raise ValueError(f"考試會話 '{session_id}' 不存在")
@@ -178,14 +177,13 @@ class ExamSessionService:
 
         try:
             db_session.status = ExamSessionStatus.IN_PROGRESS
-            db_session.start_time = datetime.utcnow()
+            db_session.start_time = self.clock()
 
             self.db.commit()
             self.db.refresh(db_session)
 
             # 更新快取
-            if self.redis:
-                await self._cache_session_state(db_session)
+            await self._cache_session_state(db_session)
 
             return self._to_response_model(db_session)
 
@@ -195,9 +193,7 @@ class ExamSessionService:
 
     async def pause_session(self, session_id: str) -> ExamSessionResponse:
         """暫停考試會話"""
-        db_session = self.db.query(ExamSession).filter(
-            ExamSession.id == session_id
-        ).first()
+        db_session = self._find_session(session_id)
 
         if not db_session:
             raise ValueError(f"考試會話 '{session_id}' 不存在")
@@ -207,14 +203,13 @@ class ExamSessionService:
 
         try:
             db_session.status = ExamSessionStatus.PAUSED
-            db_session.paused_time = datetime.utcnow()
+            db_session.paused_time = self.clock()
 
             self.db.commit()
             self.db.refresh(db_session)
 
             # 更新快取
-            if self.redis:
-                await self._cache_session_state(db_session)
+            await self._cache_session_state(db_session)
 
             return self._to_response_model(db_session)
 
@@ -224,9 +219,7 @@ class ExamSessionService:
 
     async def resume_session(self, session_id: str) -> ExamSessionResponse:
         """恢復考試會話"""
-        db_session = self.db.query(ExamSession).filter(
-            ExamSession.id == session_id
-        ).first()
+        db_session = self._find_session(session_id)
 
         if not db_session:
             raise ValueError(f"考試會話 '{session_id}' 不存在")
@@ -236,14 +229,13 @@ class ExamSessionService:
 
         try:
             db_session.status = ExamSessionStatus.IN_PROGRESS
-            db_session.resumed_time = datetime.utcnow()
+            db_session.resumed_time = self.clock()
 
             self.db.commit()
             self.db.refresh(db_session)
 
             # 更新快取
-            if self.redis:
-                await self._cache_session_state(db_session)
+            await self._cache_session_state(db_session)
 
             return self._to_response_model(db_session)
 
@@ -253,9 +245,7 @@ class ExamSessionService:
 
     async def complete_session(self, session_id: str) -> ExamSessionResponse:
         """完成考試會話"""
-        db_session = self.db.query(ExamSession).filter(
-            ExamSession.id == session_id
-        ).first()
+        db_session = self._find_session(session_id)
 
         if not db_session:
             raise ValueError(f"考試會話 '{session_id}' 不存在")
@@ -265,7 +255,7 @@ class ExamSessionService:
 
         try:
             db_session.status = ExamSessionStatus.COMPLETED
-            db_session.end_time = datetime.utcnow()
+            db_session.end_time = self.clock()
 
             # 計算最終分數（簡化版本）
             scores = json.loads(db_session.scores_json) if db_session.scores_json else {}
@@ -275,8 +265,7 @@ class ExamSessionService:
             self.db.refresh(db_session)
 
             # 清除快取
-            if self.redis:
-                await self._clear_session_cache(session_id)
+            await self._clear_session_cache(session_id)
 
             return self._to_response_model(db_session)
 
@@ -286,9 +275,11 @@ class ExamSessionService:
 
     async def submit_answer(self, session_id: str, question_id: int, answer_data: Dict[str, Any]) -> Dict[str, Any]:
         """提交題目答案"""
-        db_session = self.db.query(ExamSession).filter(
-            ExamSession.id == session_id
-        ).first()
+        return await self.submit_answers(session_id, {question_id: answer_data})
+
+    async def submit_answers(self, session_id: str, answers_by_question: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """批次提交多題答案，整批只解析與寫回一次 answers_json 並提交一次"""
+        db_session = self._find_session(session_id)
 
         if not db_session:
             raise ValueError(f"考試會話 '{session_id}' 不存在")
@@ -299,10 +290,12 @@ class ExamSessionService:
         try:
             # 更新答案記錄
             answers = json.loads(db_session.answers_json) if db_session.answers_json else {}
-            answers[str(question_id)] = {
-                "data": answer_data,
-                "submitted_at": datetime.utcnow().isoformat()
-            }
+            submitted_at = self.clock().isoformat()
+            for question_id, answer_data in answers_by_question.items():
+                answers[str(question_id)] = {
+                    "data": answer_data,
+                    "submitted_at": submitted_at
+                }
             db_session.answers_json = json.dumps(answers)
 
             self.db.commit()
@@ -313,6 +306,12 @@ class ExamSessionService:
             self.db.rollback()
             raise RuntimeError(f"提交答案失敗: {str(e)}")
 
+    def _find_session(self, session_id: str) -> Optional[ExamSession]:
+        """依 ID 查詢考試會話，不存在時回傳 None"""
+        return self.db.execute(
+            select(ExamSession).where(ExamSession.id == session_id)
+        ).scalar_one_or_none()
+
     def _to_response_model(self, db_session: ExamSession) -> ExamSessionResponse:
         """轉換為回應模型"""
         return ExamSessionResponse(
@@ -333,9 +332,6 @@ class ExamSessionService:
 
     async def _cache_session_state(self, session: ExamSession):
         """快取會話狀態"""
-        if not self.redis:
-            return
-
         cache_key = f"session:{session.id}"
         cache_data = {
             "id": session.id,
@@ -348,8 +344,5 @@ class ExamSessionService:
 
     async def _clear_session_cache(self, session_id: str):
         """清除會話快取"""
-        if not self.redis:
-            return
-
         cache_key = f"session:{session_id}"
         self.redis.delete(cache_key)
\ No newline at end of file
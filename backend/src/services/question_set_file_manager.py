@@ -2,10 +2,10 @@
 T027: QuestionSetFileManager 類別
 題組檔案管理器，負載入和監控 JSON 檔案
 """
-import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional, Set
+from pydantic import BaseModel
 from watchfiles import awatch
 import asyncio
 import logging
@@ -16,6 +16,20 @@ from ..models.question_set_data import QuestionSetData, QuestionSetMetadata, Que
 logger = logging.getLogger(__name__)
 
 
+# 題組目錄中需要監控的檔案
+_WATCHED_FILES = ("metadata.json", "questions.json")
+
+
+def _question_set_file_filter(change, path: str) -> bool:
+    """awatch 過濾器：只保留題組檔案的變更，編輯器暫存檔與腳本等其他檔案的事件直接丟棄"""
+    return os.path.basename(path) in _WATCHED_FILES
+
+
+class _QuestionsFile(BaseModel):
+    """questions.json 檔案結構；只取 questions，其餘欄位（如 set_info）忽略"""
+    questions: List[QuestionData]
+
+
 class QuestionSetFileManager:
     """題組檔案管理器"""
 
@@ -110,17 +124,9 @@ class QuestionSetFileManager:
         questions_file = set_dir / "questions.json"
         scripts_dir = set_dir / "scripts"
 
-        # 載入 metadata
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            metadata_data = json.load(f)
-
-        # 載入 questions
-        with open(questions_file, 'r', encoding='utf-8') as f:
-            questions_data = json.load(f)
-
-        # 驗證和建立模型
-        metadata = QuestionSetMetadata(**metadata_data)
-        questions = [QuestionData(**q) for q in questions_data["questions"]]
+        # 載入並驗證 metadata 與 questions：model_validate_json 在 pydantic-core 內一次完成 JSON 解析與驗證
+        metadata = QuestionSetMetadata.model_validate_json(metadata_file.read_bytes())
+        questions = _QuestionsFile.model_validate_json(questions_file.read_bytes()).questions
 
         # 更新檔案時間戳
         self._file_timestamps[str(metadata_file)] = metadata_file.stat().st_mtime
@@ -159,7 +165,8 @@ class QuestionSetFileManager:
     async def _watch_files(self) -> None:
         """檔案監控循環"""
         try:
-            async for changes in awatch(str(self.base_dir)):
+            # 仍監控整個根目錄以涵蓋新增的題組目錄與以改名方式儲存的檔案，再以過濾器略過無關事件
+            async for changes in awatch(str(self.base_dir), watch_filter=_question_set_file_filter):
                 logger.info(f"檢測到檔案變更: {changes}")
                 await self._handle_file_changes(changes)
         except asyncio.CancelledError:
@@ -174,7 +181,7 @@ class QuestionSetFileManager:
 
         for change_type, file_path in changes:
             file_path = Path(file_path)
-            if file_path.name in ["metadata.json", "questions.json"]:
+            if file_path.name in _WATCHED_FILES:
                 changed_dirs.add(file_path.parent)
 
         # 重新載入變更的題組
@@ -8,6 +8,7 @@ import asyncio
 import subprocess
 from datetime import datetime
 from typing import List, Optional, Dict, Any
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 import redis
@@ -46,12 +47,8 @@ class VMClusterService:
     async def create_vm_config(self, config_request: CreateVMConfigRequest) -> VMClusterConfigResponse:
         """建立 VM 配置（覆蓋更新模式）"""
         try:
-            # 檢查是否已有配置，如有則刪除既有的
-            existing_configs = await self.list_vm_configs()
-            if existing_configs:
-                # 覆蓋更新：刪除所有現有配置
-                for config in existing_configs:
-                    await self.delete_vm_config(config.id)
+            # 覆蓋更新：直接在資料庫端刪除所有現有配置，不經過列表快取
+            self._bulk_delete_active()
 
             # 生成 ID（如果未提供）
             config_id = config_request.id or str(uuid.uuid4())
@@ -75,8 +72,8 @@ class VMClusterService:
             self.db.commit()
             self.db.refresh(db_config)
 
-            # 更新快取
-            await self._update_cache(db_config)
+            # 舊配置已刪除，一次清除所有相關快取
+            await self._clear_cache()
 
             return self._to_response_model(db_config)
 
@@ -84,6 +81,15 @@ class VMClusterService:
             self.db.rollback()
             raise RuntimeError(f"建立 VM 配置失敗: {str(e)}")
 
+    def _bulk_delete_active(self) -> List[str]:
+        """批次刪除所有啟用中的配置，回傳被刪除的 ID（不提交交易）"""
+        result = self.db.execute(
+            delete(VMClusterConfig)
+            .where(VMClusterConfig.is_active == "true")
+            .returning(VMClusterConfig.id)
+        )
+        return list(result.scalars().all())
+
     async def get_vm_config(self, config_id: str) -> Optional[VMClusterConfigDetailed]:
         """獲取 VM 配置詳細資訊"""
         db_config = self.db.query(VMClusterConfig).filter(
@@ -4,14 +4,13 @@ T066: VM 配置檔案管理服務
 """
 import os
 import json
+import ijson
 import yaml
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 from datetime import datetime
 
-from ..models.vm_cluster_config import VMClusterConfig, VMClusterConfigCreate
-
 logger = logging.getLogger(__name__)
 
 
@@ -42,12 +41,12 @@ class VMConfigFileService:
                             "extension": config_file.suffix.lower()
                         }
 
-                        # 嘗試讀取檔案內容以驗證格式
+                        # 只擷取列表需要的欄位，同時驗證格式
                         try:
-                            content = self._read_config_file(config_file)
+                            config_name, node_count = self._read_config_metadata(config_file)
                             file_info["valid"] = True
-                            file_info["config_name"] = content.get("name", config_file.stem)
-                            file_info["node_count"] = len(content.get("nodes", []))
+                            file_info["config_name"] = config_name
+                            file_info["node_count"] = node_count
                         except Exception as e:
                             file_info["valid"] = False
                             file_info["error"] = str(e)
@@ -79,6 +78,50 @@ class VMConfigFileService:
             else:  # YAML
                 return yaml.safe_load(f)
 
+    def _read_config_metadata(self, config_path: Path) -> Tuple[Any, int]:
+        """內部方法：只讀取配置名稱與節點數量
+
+        結果與完整解析後的 content.get("name", 檔名) 和 len(content.get("nodes", [])) 相同。
+        JSON 檔案以 ijson 串流解析，nodes 為陣列時只計算項目數，不建立節點內容；
+        YAML 不支援串流，退回完整解析。
+        """
+        if config_path.suffix.lower() != '.json':
+            content = self._read_config_file(config_path)
+            return content.get("name", config_path.stem), len(content.get("nodes", []))
+
+        name = config_path.stem
+        node_count = 0
+        builder = None  # 正在組成的 name 值，或非陣列的 nodes 值
+        building = None
+        with open(config_path, 'rb') as f:
+            events = ijson.parse(f, use_float=True)
+            _, first_event, _ = next(events)
+            if first_event != "start_map":
+                raise ValueError("配置檔案頂層必須是物件")
+            for prefix, event, value in events:
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == building and event in ("end_map", "end_array"):
+                        if building == "name":
+                            name = builder.value
+                        else:
+                            node_count = len(builder.value)
+                        builder = building = None
+                elif prefix == "nodes" and event == "start_array":
+                    node_count = 0
+                elif prefix == "nodes.item" and event not in ("map_key", "end_map", "end_array"):
+                    node_count += 1
+                elif prefix in ("name", "nodes") and event in ("start_map", "start_array"):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    building = prefix
+                elif prefix == "name":
+                    name = value
+                elif prefix == "nodes" and event != "end_array":
+                    # 與完整解析相同：純量沒有長度時拋出 TypeError，字串為字元數
+                    node_count = len(value)
+        return name, node_count
+
     def validate_config(self, config_data: Dict[str, Any]) -> Dict[str, Any]:
         """驗證配置檔案格式"""
         validation_result = {
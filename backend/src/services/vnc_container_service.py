@@ -4,13 +4,18 @@ T065: VNC 容器啟動邏輯
 """
 import logging
 from typing import Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 from .container_service import get_container_service
 
 logger = logging.getLogger(__name__)
 
 
+def _utc_now_iso() -> str:
+    """取得目前 UTC 時間的 ISO 字串（秒級精度）"""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
 class VNCContainerService:
     """VNC 容器管理服務"""
 
@@ -22,6 +27,7 @@ class VNCContainerService:
     async def create_vnc_container(self, session_id: str, custom_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """建立 VNC 容器"""
         try:
+            now_iso = _utc_now_iso()
             container_name = f"vnc-{session_id[:8]}"
 
             # 預設配置
@@ -50,7 +56,7 @@ class VNCContainerService:
                 "labels": {
                     "exam.session.id": session_id,
                     "exam.container.type": "vnc",
-                    "exam.created_at": datetime.utcnow().isoformat()
+                    "exam.created_at": now_iso
                 },
                 "restart_policy": {"Name": "unless-stopped"}
             }
@@ -85,7 +91,7 @@ class VNCContainerService:
                     ]
                 },
                 "status": "created",
-                "created_at": result.get("created_at", datetime.utcnow().isoformat())
+                "created_at": result.get("created_at", now_iso)
             }
 
         except Exception as e:
@@ -136,7 +142,7 @@ Host bastion
                 "ssh_configured": True,
                 "bastion_host": bastion_container_name,
                 "ssh_config": ssh_config,
-                "configured_at": datetime.utcnow().isoformat()
+                "configured_at": _utc_now_iso()
             }
 
         except Exception as e:
@@ -172,7 +178,7 @@ Host bastion
                     "ready": container_info.get("status") == "running"
                 },
                 "created_at": vnc_container.get("created"),
-                "retrieved_at": datetime.utcnow().isoformat()
+                "retrieved_at": _utc_now_iso()
             }
 
         except Exception as e:
@@ -219,7 +225,7 @@ Host bastion
                 "container_id": vnc_container["container_id"],
                 "status": "stopped",
                 "stop_result": stop_result,
-                "stopped_at": datetime.utcnow().isoformat()
+                "stopped_at": _utc_now_iso()
             }
 
         except Exception as e:
@@ -252,7 +258,7 @@ Host bastion
                 "container_id": vnc_container["container_id"],
                 "status": "removed",
                 "remove_result": remove_result,
-                "removed_at": datetime.utcnow().isoformat()
+                "removed_at": _utc_now_iso()
             }
 
         except Exception as e:
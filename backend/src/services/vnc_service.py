@@ -2,26 +2,155 @@
 T034: VNCService VNC 存取服務
 提供 VNC 連線的 Token 管理和存取控制
 """
+import os
 import json
 import uuid
-import secrets
+import base64
 import logging
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 
-from ..cache.redis_client import get_redis
+from ..cache.redis_client import get_async_redis
+from ..cache.ttl_cache import TTLCache
 from ..models.exam_session import ExamSession
 
 logger = logging.getLogger(__name__)
 
+# 檢查會話既有 Token，不存在時一次寫入 Token、連線計數與會話索引
+# KEYS: [會話索引 key, 新 Token key, 新連線計數 key]
+# ARGV: [會話索引 JSON, 存活秒數, Token key 前綴, Token 欄位1, 值1, 欄位2, 值2, ...]
+# 回傳: 既有的 {token, vnc_url, expires_at, max_connections}，新建立時回傳 nil
+# Token 與索引皆由 Redis TTL 過期，不需再比對時間；索引指向的 Token 已不存在時直接覆寫索引
+_CREATE_TOKEN_LUA = """
+local index = redis.call('GET', KEYS[1])
+if index then
+    local existing = cjson.decode(index)['token']
+    local data = redis.call(
+        'HMGET', ARGV[3] .. existing, 'vnc_url', 'expires_at', 'max_connections'
+    )
+    if data[1] then
+        return {existing, data[1], data[2], data[3]}
+    end
+end
+redis.call('HSET', KEYS[2], unpack(ARGV, 4))
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+redis.call('SET', KEYS[3], 0, 'EX', ARGV[2])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return nil
+"""
+
+# 撤銷會話 Token 及其索引
+# KEYS: [會話索引 key]
+# ARGV: [Token key 前綴, 連線計數 key 前綴]
+# 回傳: 被撤銷的 Token，會話沒有 Token 時回傳 nil
+_REVOKE_SESSION_TOKEN_LUA = """
+local index = redis.call('GET', KEYS[1])
+if not index then
+    return nil
+end
+local token = cjson.decode(index)['token']
+redis.call('DEL', ARGV[1] .. token, ARGV[2] .. token, KEYS[1])
+return token
+"""
+
+# 連線計數 key 不存在時（例如被誤刪）以 Token 的剩餘時間重建，避免留下永久 key；
+# Token 本身沒有 TTL 時 PTTL 為 -1，PEXPIRE 負值會直接刪除計數 key，因此只在大於 0 時設定
+_ENSURE_CONNECTION_TTL_LUA = """
+if redis.call('PTTL', KEYS[1]) < 0 then
+    local token_ttl = redis.call('PTTL', KEYS[2])
+    if token_ttl > 0 then
+        redis.call('PEXPIRE', KEYS[1], token_ttl)
+    end
+end
+"""
+
+# 在連線數上限內原子地增加連線計數
+# KEYS: [連線計數 key, Token key]
+# ARGV: [最大連線數]
+# 回傳: 新的連線數；-1 表示已達上限，-2 表示 Token 不存在
+_INCREMENT_CONNECTION_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return -2
+end
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+if count >= tonumber(ARGV[1]) then
+    return -1
+end
+count = redis.call('INCR', KEYS[1])
+""" + _ENSURE_CONNECTION_TTL_LUA + """
+return count
+"""
+
+# 原子地減少連線計數，最低為 0
+# KEYS: [連線計數 key, Token key]
+# 回傳: 新的連線數；-1 表示 Token 不存在
+_DECREMENT_CONNECTION_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return -1
+end
+local count = redis.call('DECR', KEYS[1])
+if count < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    count = 0
+end
+""" + _ENSURE_CONNECTION_TTL_LUA + """
+return count
+"""
+
+
+# Redis Cluster 相容：同一會話的所有 key 以 {session_id} 作為 hash tag，
+# 確保落在同一個 slot，Lua 腳本與 pipeline 才能同時操作。
+# 會話 ID 只出現在 key 中；回傳給客戶端的 Token 只有亂數部分，
+# 因此查詢 Token 時由呼叫端一併提供會話 ID（VNC 路徑本身就以會話區分）。
+# key 以字串串接組成，熱路徑上不需解析 f-string。
+
+
+_SESS_PREFIX = "session_vnc_token:{"
+_TOK_PREFIX = "vnc_token:{"
+_CONN_PREFIX = "vnc_conn:{"
+
+
+def _index_key(session_id: str) -> str:
+    """會話 Token 索引 key"""
+    return _SESS_PREFIX + session_id + "}"
+
+
+def _token_prefix(session_id: str) -> str:
+    """會話 Token 資料 key 前綴"""
+    return _TOK_PREFIX + session_id + "}:"
+
+
+def _conn_prefix(session_id: str) -> str:
+    """會話連線計數 key 前綴"""
+    return _CONN_PREFIX + session_id + "}:"
+
+
+def _token_key(session_id: str, token: str) -> str:
+    """Token 資料 key"""
+    return _TOK_PREFIX + session_id + "}:" + token
+
+
+def _conn_key(session_id: str, token: str) -> str:
+    """Token 連線計數 key"""
+    return _CONN_PREFIX + session_id + "}:" + token
+
 
 class VNCService:
     """VNC 存取服務"""
 
     def __init__(self):
-        self.redis_client = get_redis()
+        self.redis_client = get_async_redis()
         self.token_timeout = 3600  # 1小時
         self.max_connections_per_session = 1  # 單一會話限制
+        # Token 資料建立後不會變動，行程內快取可省去驗證時的 Redis 讀取與 JSON 解析；
+        # 以 Token 資料 key 為快取 key，連線計數仍每次從 Redis 讀取，計數 key 消失即代表 Token 已被撤銷或過期
+        self._token_cache = TTLCache(maxsize=4096, ttl=60)
+        # 以 EVALSHA 執行，Redis 重啟後遇到 NOSCRIPT 會自動重新載入
+        self._create_token_script = self.redis_client.register_script(_CREATE_TOKEN_LUA)
+        self._revoke_session_token_script = self.redis_client.register_script(_REVOKE_SESSION_TOKEN_LUA)
+        self._increment_connection_script = self.redis_client.register_script(_INCREMENT_CONNECTION_LUA)
+        self._decrement_connection_script = self.redis_client.register_script(_DECREMENT_CONNECTION_LUA)
 
     async def create_vnc_token(self, session_id: str, vnc_container_id: str) -> Dict[str, Any]:
         """
@@ -35,15 +164,11 @@ class VNCService:
             Dict: 包含 Token 和存取資訊的字典
         """
         try:
-            # 檢查現有 Token
-            existing_token = await self._get_existing_token(session_id)
-            if existing_token:
-                logger.info(f"會話 {session_id} 已有有效的 VNC Token")
-                return existing_token
-
             # 生成新的 Token
             token = self._generate_token()
             vnc_url = f"/vnc/{token}"
+            now = datetime.utcnow()
+            expires_at = now + timedelta(seconds=self.token_timeout)
 
             # Token 資料
             token_data = {
@@ -51,17 +176,18 @@ class VNCService:
                 "session_id": session_id,
                 "vnc_container_id": vnc_container_id,
                 "vnc_url": vnc_url,
-                "created_at": datetime.utcnow().isoformat(),
-                "expires_at": (datetime.utcnow() + timedelta(seconds=self.token_timeout)).isoformat(),
-                "active_connections": 0,
+                "created_at": now.isoformat(),
+                "expires_at": expires_at.isoformat(),
                 "max_connections": self.max_connections_per_session
             }
 
-            # 儲存 Token 到 Redis
-            await self._store_token(token, token_data)
-            await self._index_session_token(session_id, token)
+            # 檢查現有 Token，沒有則儲存新 Token 與會話索引（單次往返）
+            existing = await self._create_or_get_token(session_id, token, token_data)
+            if existing:
+                logger.info("會話 %s 已有有效的 VNC Token", session_id)
+                return existing
 
-            logger.info(f"為會話 {session_id} 建立 VNC Token: {token}")
+            logger.info("為會話 %s 建立 VNC Token", session_id)
 
             return {
                 "token": token,
@@ -71,97 +197,91 @@ class VNCService:
             }
 
         except Exception as e:
-            logger.error(f"建立 VNC Token 失敗 (會話: {session_id}): {e}")
+            logger.error("建立 VNC Token 失敗 (會話: %s): %s", session_id, e)
             raise RuntimeError(f"建立 VNC Token 失敗: {str(e)}")
 
-    async def validate_vnc_token(self, token: str) -> Optional[Dict[str, Any]]:
+    async def validate_vnc_token(self, session_id: str, token: str) -> Optional[Dict[str, Any]]:
         """
         驗證 VNC Token
 
         Args:
+            session_id: 考試會話 ID
             token: VNC Token
 
         Returns:
             Optional[Dict]: Token 資料，如果無效則返回 None
         """
         try:
-            token_data = await self._get_token_data(token)
+            token_data, active_connections = await self._get_token_state(session_id, token)
             if not token_data:
                 return None
 
-            # 檢查是否過期
-            expires_at = datetime.fromisoformat(token_data["expires_at"])
-            if datetime.utcnow() > expires_at:
-                await self._invalidate_token(token)
-                logger.info(f"VNC Token {token} 已過期")
-                return None
+            # 過期由 Redis TTL 處理：過期的 Token 與連線計數 key 會直接消失
 
             # 檢查連線數限制
+            token_data["active_connections"] = active_connections
             if token_data["active_connections"] >= token_data["max_connections"]:
-                logger.warning(f"VNC Token {token} 已達連線數限制")
+                logger.warning("會話 %s 的 VNC Token 已達連線數限制", session_id)
                 return None
 
-            logger.info(f"VNC Token {token} 驗證成功")
+            logger.info("會話 %s 的 VNC Token 驗證成功", session_id)
             return token_data
 
         except Exception as e:
-            logger.error(f"驗證 VNC Token 失敗 ({token}): {e}")
+            logger.error("驗證 VNC Token 失敗 (會話: %s): %s", session_id, e)
             return None
 
-    async def increment_connection(self, token: str) -> bool:
+    async def increment_connection(self, session_id: str, token: str) -> bool:
         """
         增加連線計數
 
         Args:
+            session_id: 考試會話 ID
             token: VNC Token
 
         Returns:
             bool: 是否成功增加連線
         """
         try:
-            token_data = await self._get_token_data(token)
-            if not token_data:
-                return False
-
-            # 檢查連線數限制
-            if token_data["active_connections"] >= token_data["max_connections"]:
+            # 檢查連線數限制並增加連線計數（原子操作）
+            active_connections = await self._increment_connection_script(
+                keys=[_conn_key(session_id, token), _token_key(session_id, token)],
+                args=[self.max_connections_per_session]
+            )
+            if active_connections < 0:
                 return False
 
-            # 增加連線計數
-            token_data["active_connections"] += 1
-            await self._store_token(token, token_data)
-
-            logger.info(f"VNC Token {token} 連線數增加至 {token_data['active_connections']}")
+            logger.info("會話 %s 的 VNC 連線數增加至 %d", session_id, active_connections)
             return True
 
         except Exception as e:
-            logger.error(f"增加 VNC 連線計數失敗 ({token}): {e}")
+            logger.error("增加 VNC 連線計數失敗 (會話: %s): %s", session_id, e)
             return False
 
-    async def decrement_connection(self, token: str) -> bool:
+    async def decrement_connection(self, session_id: str, token: str) -> bool:
         """
         減少連線計數
 
         Args:
+            session_id: 考試會話 ID
             token: VNC Token
 
         Returns:
             bool: 是否成功減少連線
         """
         try:
-            token_data = await self._get_token_data(token)
-            if not token_data:
+            # 減少連線計數（原子操作）
+            active_connections = await self._decrement_connection_script(
+                keys=[_conn_key(session_id, token), _token_key(session_id, token)]
+            )
+            if active_connections < 0:
                 return False
 
-            # 減少連線計數
-            token_data["active_connections"] = max(0, token_data["active_connections"] - 1)
-            await self._store_token(token, token_data)
-
-            logger.info(f"VNC Token {token} 連線數減少至 {token_data['active_connections']}")
+            logger.info("會話 %s 的 VNC 連線數減少至 %d", session_id, active_connections)
             return True
 
         except Exception as e:
-            logger.error(f"減少 VNC 連線計數失敗 ({token}): {e}")
+            logger.error("減少 VNC 連線計數失敗 (會話: %s): %s", session_id, e)
             return False
 
     async def revoke_session_tokens(self, session_id: str) -> bool:
@@ -175,104 +295,176 @@ class VNCService:
             bool: 是否成功撤銷
         """
         try:
-            # 取得會話的 Token
-            token = await self._get_session_token(session_id)
-            if not token:
-                logger.info(f"會話 {session_id} 沒有 VNC Token")
+            # 撤銷 Token 與會話索引（單次往返）
+            revoked_token = await self._revoke_session_token_script(
+                keys=[_index_key(session_id)],
+                args=[_token_prefix(session_id), _conn_prefix(session_id)]
+            )
+            if not revoked_token:
+                logger.info("會話 %s 沒有 VNC Token", session_id)
                 return True
 
-            # 撤銷 Token
-            await self._invalidate_token(token)
-            await self._remove_session_token_index(session_id)
+            self._token_cache.pop(_token_key(session_id, revoked_token))
 
-            logger.info(f"已撤銷會話 {session_id} 的 VNC Token")
+            logger.info("已撤銷會話 %s 的 VNC Token", session_id)
             return True
 
         except Exception as e:
-            logger.error(f"撤銷會話 VNC Token 失敗 (會話: {session_id}): {e}")
+            logger.error("撤銷會話 VNC Token 失敗 (會話: %s): %s", session_id, e)
             return False
 
-    def _generate_token(self) -> str:
-        """生成安全的 VNC Token"""
-        return secrets.token_urlsafe(32)
-
-    async def _store_token(self, token: str, token_data: Dict[str, Any]) -> None:
-        """儲存 Token 到 Redis"""
-        if self.redis_client.connected:
-            key = f"vnc_token:{token}"
-            self.redis_client.set(key, token_data, self.token_timeout)
-
-    async def _get_token_data(self, token: str) -> Optional[Dict[str, Any]]:
-        """從 Redis 獲取 Token 資料"""
-        if not self.redis_client.connected:
-            return None
-
-        key = f"vnc_token:{token}"
-        return self.redis_client.get(key)
-
-    async def _invalidate_token(self, token: str) -> None:
-        """使 Token 失效"""
-        if self.redis_client.connected:
-            key = f"vnc_token:{token}"
-            self.redis_client.delete(key)
-
-    async def _index_session_token(self, session_id: str, token: str) -> None:
-        """建立會話到 Token 的索引"""
-        if self.redis_client.connected:
-            key = f"session_vnc_token:{session_id}"
-            self.redis_client.set(key, {"token": token}, self.token_timeout)
-
-    async def _get_session_token(self, session_id: str) -> Optional[str]:
-        """獲取會話的 Token"""
-        if not self.redis_client.connected:
-            return None
+    async def revoke_many(self, session_ids: List[str]) -> int:
+        """
+        批次撤銷多個會話的 VNC Token（單次往返，供重置或關閉時使用）
 
-        key = f"session_vnc_token:{session_id}"
-        data = self.redis_client.get(key)
-        return data.get("token") if data else None
+        Args:
+            session_ids: 考試會話 ID 列表
 
-    async def _remove_session_token_index(self, session_id: str) -> None:
-        """移除會話 Token 索引"""
-        if self.redis_client.connected:
-            key = f"session_vnc_token:{session_id}"
-            self.redis_client.delete(key)
+        Returns:
+            int: 實際撤銷的 Token 數量
+        """
+        if not session_ids:
+            return 0
 
-    async def _get_existing_token(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """檢查會話是否已有有效的 Token"""
-        token = await self._get_session_token(session_id)
-        if not token:
-            return None
+        try:
+            # 每個會話各自執行撤銷腳本，腳本只操作同一 hash tag 的 key，Redis Cluster 下也安全
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    await self._revoke_session_token_script(
+                        keys=[_index_key(session_id)],
+                        args=[_token_prefix(session_id), _conn_prefix(session_id)],
+                        client=pipe
+                    )
+                revoked_keys = [
+                    _token_key(session_id, token)
+                    for session_id, token in zip(session_ids, await pipe.execute()) if token
+                ]
+
+            for key in revoked_keys:
+                self._token_cache.pop(key)
+
+            logger.info("已批次撤銷 %d 個 VNC Token", len(revoked_keys))
+            return len(revoked_keys)
 
-        token_data = await self._get_token_data(token)
-        if not token_data:
-            # 清理失效的索引
-            await self._remove_session_token_index(session_id)
-            return None
+        except Exception as e:
+            logger.error("批次撤銷 VNC Token 失敗: %s", e)
+            return 0
 
-        # 檢查是否過期
-        expires_at = datetime.fromisoformat(token_data["expires_at"])
-        if datetime.utcnow() > expires_at:
-            await self._invalidate_token(token)
-            await self._remove_session_token_index(session_id)
+    def _generate_token(self) -> str:
+        """生成安全的 VNC Token（32 bytes 亂數，URL-safe base64 去除填充）"""
+        return base64.urlsafe_b64encode(os.urandom(32)).rstrip(b"=").decode("ascii")
+
+    async def _get_token_state(self, session_id: str, token: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        """以單次往返獲取 Token 資料與目前的連線數（Token 資料優先從行程內快取讀取）"""
+        token_key = _token_key(session_id, token)
+        cached = self._token_cache.get(token_key)
+        if cached is not None:
+            active_connections = await self.redis_client.get(_conn_key(session_id, token))
+            if active_connections is None:
+                self._token_cache.pop(token_key)
+                return None, 0
+            return dict(cached), int(active_connections)
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(token_key)
+            pipe.get(_conn_key(session_id, token))
+            token_hash, active_connections = await pipe.execute()
+
+        if not token_hash:
+            return None, 0
+
+        token_data = self._decode_token_hash(token_hash)
+        self._token_cache.set(token_key, token_data)
+        return dict(token_data), int(active_connections or 0)
+
+    async def _create_or_get_token(
+        self, session_id: str, token: str, token_data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """原子地取得會話既有 Token 的回應，或寫入新 Token 與會話索引"""
+        fields = []
+        for field, value in token_data.items():
+            fields.extend((field, value))
+
+        existing = await self._create_token_script(
+            keys=[
+                _index_key(session_id),
+                _token_key(session_id, token),
+                _conn_key(session_id, token)
+            ],
+            args=[
+                json.dumps({"token": token}),
+                self.token_timeout,
+                _token_prefix(session_id),
+                *fields
+            ]
+        )
+        if not existing:
             return None
 
+        existing_token, vnc_url, expires_at, max_connections = existing
         return {
-            "token": token,
-            "vnc_url": token_data["vnc_url"],
-            "expires_at": token_data["expires_at"],
-            "max_connections": token_data["max_connections"]
+            "token": existing_token,
+            "vnc_url": vnc_url,
+            "expires_at": expires_at,
+            "max_connections": int(max_connections)
         }
 
-    async def get_token_stats(self, token: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _decode_token_hash(token_hash: Dict[str, str]) -> Dict[str, Any]:
+        """還原 Redis hash 中 Token 欄位的型別"""
+        token_data = dict(token_hash)
+        token_data["max_connections"] = int(token_data["max_connections"])
+        return token_data
+
+    async def get_token_stats(self, session_id: str, token: str) -> Optional[Dict[str, Any]]:
         """獲取 Token 統計資訊"""
-        token_data = await self._get_token_data(token)
+        token_data, active_connections = await self._get_token_state(session_id, token)
         if not token_data:
             return None
 
+        return self._project_stats(token_data, active_connections)
+
+    async def get_token_stats_bulk(self, tokens: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        批次獲取多個 Token 的統計資訊（單次往返）
+
+        Args:
+            tokens: (考試會話 ID, VNC Token) 列表
+
+        Returns:
+            Dict: Token 對應統計資訊，不存在的 Token 不會出現在結果中
+        """
+        if not tokens:
+            return {}
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for session_id, token in tokens:
+                pipe.hgetall(_token_key(session_id, token))
+                pipe.get(_conn_key(session_id, token))
+            rows = await pipe.execute()
+
+        stats = {}
+        for (session_id, token), token_hash, active_connections in zip(tokens, rows[0::2], rows[1::2]):
+            if not token_hash:
+                continue
+            token_data = self._decode_token_hash(token_hash)
+            self._token_cache.set(_token_key(session_id, token), token_data)
+            stats[token] = self._project_stats(token_data, int(active_connections or 0))
+        return stats
+
+    @staticmethod
+    def _project_stats(token_data: Dict[str, Any], active_connections: int) -> Dict[str, Any]:
+        """整理 Token 統計資訊"""
         return {
-            "active_connections": token_data["active_connections"],
+            "active_connections": active_connections,
             "max_connections": token_data["max_connections"],
             "created_at": token_data["created_at"],
             "expires_at": token_data["expires_at"],
             "session_id": token_data["session_id"]
-        }
\ No newline at end of file
+        }
+
+
+@lru_cache(maxsize=1)
+def get_vnc_service() -> VNCService:
+    """取得 VNC 服務依賴注入（第一次使用時才建立，之後共用同一實例）"""
+    return VNCService()
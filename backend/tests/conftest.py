@@ -1,94 +1,180 @@
 """
 測試配置和共用 fixtures
 """
-import asyncio
+import copy
+import os
+import shutil
+import tempfile
 import pytest
-from fastapi.testclient import TestClient
-from httpx import AsyncClient
-from typing import AsyncGenerator, Generator
+from types import MappingProxyType
+from typing import TYPE_CHECKING, AsyncGenerator, Generator
+
+if TYPE_CHECKING:
+    # 只用於型別標註；FastAPI 與 httpx 在 fixture 第一次使用時才匯入，
+    # 不需要 API 的測試模組不必載入應用與 Pydantic 驗證器
+    from fastapi.testclient import TestClient
+    from httpx import AsyncClient
 
 # 這裡先建立基本框架，實際實作會在後續任務中完成
 
+# 測試使用暫存目錄中的 SQLite，必須在匯入 src 之前設定；
+# pytest-xdist 每個 worker 都是獨立行程，各自使用自己的資料庫檔案。
+# worker 會繼承主行程的環境變數，因此由本檔產生的預設值要在 worker 中重新產生，
+# 使用者自行指定的 DATABASE_URL 則保持不變
+_GENERATED_DATABASE_URL = "CK_EP_TEST_DATABASE_URL_GENERATED"
+if "DATABASE_URL" not in os.environ or os.environ.get(_GENERATED_DATABASE_URL):
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(prefix="exam-simulator-test-"),
+        f"test-{os.environ.get('PYTEST_XDIST_WORKER', 'main')}.db"
+    )
+    os.environ[_GENERATED_DATABASE_URL] = "1"
+
+
+def pytest_addoption(parser):
+    """註冊自訂命令列選項"""
+    parser.addoption(
+        "--runslow", action="store_true", default=False,
+        help="執行整合測試與標記為 slow 的測試"
+    )
+
+
+# 本次執行在 tmpfs 上建立的 tmp_path 根目錄
+_TMPFS_BASETEMP_KEY = pytest.StashKey[str]()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """未指定 --basetemp 時把 tmp_path 的根目錄放在 tmpfs 上，檔案操作不經過磁碟
+
+    需在 pytest 建立 tmp_path_factory 之前設定。每次執行各自以 mkdtemp 建立目錄，
+    不同使用者或同時進行的執行不會共用、互相清除；xdist worker 沿用主行程傳入的 basetemp。
+    非 Linux 環境沒有 /dev/shm 時沿用 pytest 預設位置。
+    """
+    if not config.option.basetemp and os.path.isdir("/dev/shm"):
+        basetemp = tempfile.mkdtemp(prefix="ck-ep-tests-", dir="/dev/shm")
+        config.option.basetemp = basetemp
+        config.stash[_TMPFS_BASETEMP_KEY] = basetemp
+
+
+def pytest_unconfigure(config):
+    """刪除本次執行建立的 tmpfs 目錄，避免佔用記憶體"""
+    basetemp = config.stash.get(_TMPFS_BASETEMP_KEY, None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
+
+def pytest_collection_modifyitems(config, items):
+    """未指定 --runslow 時略過整合測試與 slow 測試"""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="需要 --runslow 才會執行")
+    for item in items:
+        if "integration" in item.keywords or "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """建立事件循環"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def app():
+    """FastAPI 應用（整個測試 session 只匯入一次）"""
+    from src.main import app
+    return app
 
 
-@pytest.fixture
-def test_client() -> Generator[TestClient, None, None]:
-    """建立測試客戶端"""
-    # TODO: 在實作 main.py 後匯入
-    # from src.main import app
-    # with TestClient(app) as client:
-    #     yield client
-    raise NotImplementedError("等待 main.py 實作")
+@pytest.fixture(scope="session")
+def test_client(app) -> Generator["TestClient", None, None]:
+    """建立測試客戶端（整個測試 session 共用，路由與 Pydantic 驗證器只建立一次）"""
+    from fastapi.testclient import TestClient
 
+    with TestClient(app) as client:
+        # 預先產生 OpenAPI schema，所有路由模型的驗證器在第一個測試前就建立完成
+        client.get(app.openapi_url)
+        yield client
 
-@pytest.fixture
-async def async_client() -> AsyncGenerator[AsyncClient, None]:
-    """建立異步測試客戶端"""
-    # TODO: 在實作 main.py 後匯入
-    # from src.main import app
-    # async with AsyncClient(app=app, base_url="http://test") as client:
-    #     yield client
-    raise NotImplementedError("等待 main.py 實作")
+
+@pytest.fixture(autouse=True)
+def _clear_dependency_overrides(request):
+    """每個測試結束後清除依賴覆寫，避免共用的應用狀態互相影響"""
+    yield
+    if "app" in request.fixturenames:
+        request.getfixturevalue("app").dependency_overrides.clear()
 
 
 @pytest.fixture
-def mock_vm_config():
-    """模擬 VM 配置資料"""
-    return {
-        "id": "test-cluster",
-        "name": "測試叢集",
-        "description": "用於測試的 VM 配置",
-        "nodes": [
-            {
-                "name": "k8s-master",
-                "ip": "192.168.1.10",
-                "role": "master"
-            },
-            {
-                "name": "k8s-worker",
-                "ip": "192.168.1.11",
-                "role": "worker"
-            }
-        ],
-        "ssh_config": {
-            "user": "ubuntu",
-            "port": 22,
-            "private_key_path": "/root/.ssh/id_rsa"
+async def async_client(test_client) -> AsyncGenerator["AsyncClient", None]:
+    """建立異步測試客戶端（直接呼叫 ASGI 應用，不經過 TestClient 的執行緒轉接）"""
+    from httpx import ASGITransport, AsyncClient
+
+    # 應用生命週期已由共用的 test_client 啟動，這裡只更換傳輸層
+    transport = ASGITransport(app=test_client.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+# 模擬資料在整個測試 session 共用，以唯讀檢視提供避免被測試修改
+_VM_CONFIG = MappingProxyType({
+    "id": "test-cluster",
+    "name": "測試叢集",
+    "description": "用於測試的 VM 配置",
+    "nodes": [
+        {
+            "name": "k8s-master",
+            "ip": "192.168.1.10",
+            "role": "master"
+        },
+        {
+            "name": "k8s-worker",
+            "ip": "192.168.1.11",
+            "role": "worker"
         }
+    ],
+    "ssh_config": {
+        "user": "ubuntu",
+        "port": 22,
+        "private_key_path": "/root/.ssh/id_rsa"
     }
+})
+
+_QUESTION_SET = MappingProxyType({
+    "id": "test-ckad",
+    "title": "測試 CKAD 題組",
+    "certification_type": "CKAD",
+    "difficulty": "intermediate",
+    "duration_minutes": 120,
+    "total_questions": 2,
+    "total_points": 100
+})
+
+_EXAM_SESSION = MappingProxyType({
+    "id": "test-session-001",
+    "question_set_id": "test-ckad",
+    "vm_config_id": "test-cluster",
+    "status": "created",
+    "current_question_index": 0,
+    "start_time": None,
+    "end_time": None,
+    "duration_minutes": 120
+})
+
+
+@pytest.fixture(scope="session")
+def mock_vm_config():
+    """模擬 VM 配置資料（唯讀）"""
+    return _VM_CONFIG
 
 
 @pytest.fixture
+def mock_vm_config_mutable():
+    """模擬 VM 配置資料（可修改的深拷貝）"""
+    return copy.deepcopy(dict(_VM_CONFIG))
+
+
+@pytest.fixture(scope="session")
 def mock_question_set():
-    """模擬題組資料"""
-    return {
-        "id": "test-ckad",
-        "title": "測試 CKAD 題組",
-        "certification_type": "CKAD",
-        "difficulty": "intermediate",
-        "duration_minutes": 120,
-        "total_questions": 2,
-        "total_points": 100
-    }
+    """模擬題組資料（唯讀）"""
+    return _QUESTION_SET
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_exam_session():
-    """模擬考試會話資料"""
-    return {
-        "id": "test-session-001",
-        "question_set_id": "test-ckad",
-        "vm_config_id": "test-cluster",
-        "status": "created",
-        "current_question_index": 0,
-        "start_time": None,
-        "end_time": None,
-        "duration_minutes": 120
-    }
\ No newline at end of file
+    """模擬考試會話資料（唯讀）"""
+    return _EXAM_SESSION
@@ -2,115 +2,118 @@
 T013: 環境管理 API 契約測試
 測試 Kubernetes 環境管理相關的 API 端點契約
 """
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-
-
-class TestEnvironmentContract:
-    """環境管理 API 契約測試"""
-
-    def test_get_environment_status_contract(self, test_client: TestClient):
-        """測試 GET /api/v1/exam-sessions/{session_id}/environment/status 契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.get(f"/api/v1/exam-sessions/{session_id}/environment/status")
-            assert response.status_code == 200
-            data = response.json()
-            assert "status" in data
-            assert "progress" in data
-            assert "message" in data
-            assert data["status"] in ["preparing", "deploying", "ready", "failed", "timeout"]
-
-    def test_environment_status_detailed_contract(self, test_client: TestClient):
-        """測試環境狀態詳細資訊契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.get(f"/api/v1/exam-sessions/{session_id}/environment/status")
-            data = response.json()
-
-            # 檢查進度資訊
-            progress = data["progress"]
-            assert "current_step" in progress
-            assert "total_steps" in progress
-            assert "percentage" in progress
-            assert "estimated_remaining_minutes" in progress
-
-            # 檢查節點狀態（如果環境已部署）
-            if data["status"] in ["ready", "deploying"]:
-                assert "nodes" in data
-                if data["nodes"]:
-                    node = data["nodes"][0]
-                    assert "name" in node
-                    assert "ip" in node
-                    assert "status" in node
-                    assert "role" in node
-
-    def test_provision_environment_contract(self, test_client: TestClient):
-        """測試 POST /api/v1/exam-sessions/{session_id}/environment/provision 契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.post(f"/api/v1/exam-sessions/{session_id}/environment/provision")
-            assert response.status_code == 202  # Accepted - 異步操作
-            data = response.json()
-            assert "message" in data
-            assert "estimated_duration_minutes" in data
-            assert "provision_id" in data
-
-    def test_environment_provision_with_options_contract(self, test_client: TestClient):
-        """測試環境部署選項契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            provision_options = {
-                "kubernetes_version": "1.29",
-                "cni_plugin": "calico",
-                "skip_existing": True
-            }
-            response = test_client.post(
-                f"/api/v1/exam-sessions/{session_id}/environment/provision",
-                json=provision_options
-            )
-            assert response.status_code == 202
-            data = response.json()
-            assert "options" in data
-            assert data["options"]["kubernetes_version"] == "1.29"
-
-    def test_environment_logs_contract(self, test_client: TestClient):
-        """測試環境部署日誌契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.get(f"/api/v1/exam-sessions/{session_id}/environment/logs")
-            assert response.status_code == 200
-            data = response.json()
-            assert "logs" in data
-            assert isinstance(data["logs"], list)
-            if data["logs"]:
-                log_entry = data["logs"][0]
-                assert "timestamp" in log_entry
-                assert "level" in log_entry
-                assert "message" in log_entry
-
-    def test_environment_error_responses_contract(self, test_client: TestClient):
-        """測試環境管理錯誤回應契約"""
-        with pytest.raises(NotImplementedError):
-            # 404 錯誤 - 會話不存在
-            response = test_client.get("/api/v1/exam-sessions/non-existent/environment/status")
-            assert response.status_code == 404
-
-            # 409 錯誤 - 環境已在部署中
-            session_id = "test-session-001"
-            response = test_client.post(f"/api/v1/exam-sessions/{session_id}/environment/provision")
-            # 如果環境已在部署，再次觸發應該返回 409
-            if response.status_code == 409:
-                data = response.json()
-                assert "error" in data
-                assert "current_status" in data
-
-    def test_environment_cleanup_contract(self, test_client: TestClient):
-        """測試環境清理契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.delete(f"/api/v1/exam-sessions/{session_id}/environment")
-            assert response.status_code == 202  # Accepted - 異步操作
-            data = response.json()
-            assert "message" in data
-            assert "cleanup_id" in data
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+
+
+pytestmark = pytest.mark.skip(reason="等待 main.py 實作")
+
+
+def test_get_environment_status_contract(test_client: "TestClient"):
+    """測試 GET /api/v1/exam-sessions/{session_id}/environment/status 契約"""
+    session_id = "test-session-001"
+    response = test_client.get(f"/api/v1/exam-sessions/{session_id}/environment/status")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert "status" in data
+    assert "progress" in data
+    assert "message" in data
+    assert data["status"] in ["preparing", "deploying", "ready", "failed", "timeout"]
+
+
+def test_environment_status_detailed_contract(test_client: "TestClient"):
+    """測試環境狀態詳細資訊契約"""
+    session_id = "test-session-001"
+    response = test_client.get(f"/api/v1/exam-sessions/{session_id}/environment/status")
+    data = orjson.loads(response.content)
+
+    # 檢查進度資訊
+    progress = data["progress"]
+    assert "current_step" in progress
+    assert "total_steps" in progress
+    assert "percentage" in progress
+    assert "estimated_remaining_minutes" in progress
+
+    # 檢查節點狀態（如果環境已部署）
+    if data["status"] in ["ready", "deploying"]:
+        assert "nodes" in data
+        if data["nodes"]:
+            node = data["nodes"][0]
+            assert "name" in node
+            assert "ip" in node
+            assert "status" in node
+            assert "role" in node
+
+
+def test_provision_environment_contract(test_client: "TestClient"):
+    """測試 POST /api/v1/exam-sessions/{session_id}/environment/provision 契約"""
+    session_id = "test-session-001"
+    response = test_client.post(f"/api/v1/exam-sessions/{session_id}/environment/provision")
+    assert response.status_code == 202  # Accepted - 異步操作
+    data = orjson.loads(response.content)
+    assert "message" in data
+    assert "estimated_duration_minutes" in data
+    assert "provision_id" in data
+
+
+def test_environment_provision_with_options_contract(test_client: "TestClient"):
+    """測試環境部署選項契約"""
+    session_id = "test-session-001"
+    provision_options = {
+        "kubernetes_version": "1.29",
+        "cni_plugin": "calico",
+        "skip_existing": True
+    }
+    response = test_client.post(
+        f"/api/v1/exam-sessions/{session_id}/environment/provision",
+        json=provision_options
+    )
+    assert response.status_code == 202
+    data = orjson.loads(response.content)
+    assert "options" in data
+    assert data["options"]["kubernetes_version"] == "1.29"
+
+
+def test_environment_logs_contract(test_client: "TestClient"):
+    """測試環境部署日誌契約"""
+    session_id = "test-session-001"
+    response = test_client.get(f"/api/v1/exam-sessions/{session_id}/environment/logs")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert "logs" in data
+    assert isinstance(data["logs"], list)
+    if data["logs"]:
+        log_entry = data["logs"][0]
+        assert "timestamp" in log_entry
+        assert "level" in log_entry
+        assert "message" in log_entry
+
+
+def test_environment_error_responses_contract(test_client: "TestClient"):
+    """測試環境管理錯誤回應契約"""
+    # 404 錯誤 - 會話不存在
+    response = test_client.get("/api/v1/exam-sessions/non-existent/environment/status")
+    assert response.status_code == 404
+
+    # 409 錯誤 - 環境已在部署中
+    session_id = "test-session-001"
+    response = test_client.post(f"/api/v1/exam-sessions/{session_id}/environment/provision")
+    # 如果環境已在部署，再次觸發應該返回 409
+    if response.status_code == 409:
+        data = orjson.loads(response.content)
+        assert "error" in data
+        assert "current_status" in data
+
+
+def test_environment_cleanup_contract(test_client: "TestClient"):
+    """測試環境清理契約"""
+    session_id = "test-session-001"
+    response = test_client.delete(f"/api/v1/exam-sessions/{session_id}/environment")
+    assert response.status_code == 202  # Accepted - 異步操作
+    data = orjson.loads(response.content)
+    assert "message" in data
+    assert "cleanup_id" in data
\ No newline at end of file
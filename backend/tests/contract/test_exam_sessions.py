@@ -2,134 +2,137 @@
 T012: 考試會話 API 契約測試
 測試考試會話管理相關的 API 端點契約
 """
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-
-
-class TestExamSessionsContract:
-    """考試會話 API 契約測試"""
-
-    def test_get_exam_sessions_contract(self, test_client: TestClient):
-        """測試 GET /api/v1/exam-sessions 契約"""
-        with pytest.raises(NotImplementedError):
-            response = test_client.get("/api/v1/exam-sessions")
-            assert response.status_code == 200
-            data = response.json()
-            assert isinstance(data, list)
-            if data:
-                session = data[0]
-                assert "id" in session
-                assert "question_set_id" in session
-                assert "vm_config_id" in session
-                assert "status" in session
-                assert "created_at" in session
-
-    def test_create_exam_session_contract(self, test_client: TestClient):
-        """測試 POST /api/v1/exam-sessions 契約"""
-        with pytest.raises(NotImplementedError):
-            session_data = {
-                "question_set_id": "test-ckad",
-                "vm_config_id": "test-cluster"
-            }
-            response = test_client.post("/api/v1/exam-sessions", json=session_data)
-            assert response.status_code == 201
-            data = response.json()
-            assert "id" in data
-            assert data["question_set_id"] == session_data["question_set_id"]
-            assert data["vm_config_id"] == session_data["vm_config_id"]
-            assert data["status"] == "created"
-            assert data["current_question_index"] == 0
-
-    def test_get_exam_session_by_id_contract(self, test_client: TestClient):
-        """測試 GET /api/v1/exam-sessions/{session_id} 契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.get(f"/api/v1/exam-sessions/{session_id}")
-            assert response.status_code == 200
-            data = response.json()
-            assert data["id"] == session_id
-            assert "environment" in data
-            assert "current_question" in data
-            assert "progress" in data
-
-    def test_update_exam_session_contract(self, test_client: TestClient):
-        """測試 PATCH /api/v1/exam-sessions/{session_id} 契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            update_data = {
-                "current_question_index": 1
-            }
-            response = test_client.patch(f"/api/v1/exam-sessions/{session_id}", json=update_data)
-            assert response.status_code == 200
-            data = response.json()
-            assert data["current_question_index"] == 1
-
-    def test_start_exam_session_contract(self, test_client: TestClient):
-        """測試 POST /api/v1/exam-sessions/{session_id}/start 契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.post(f"/api/v1/exam-sessions/{session_id}/start")
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "in_progress"
-            assert "start_time" in data
-            assert data["start_time"] is not None
-
-    def test_pause_exam_session_contract(self, test_client: TestClient):
-        """測試 POST /api/v1/exam-sessions/{session_id}/pause 契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.post(f"/api/v1/exam-sessions/{session_id}/pause")
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "paused"
-            assert "paused_time" in data
-
-    def test_resume_exam_session_contract(self, test_client: TestClient):
-        """測試 POST /api/v1/exam-sessions/{session_id}/resume 契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.post(f"/api/v1/exam-sessions/{session_id}/resume")
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "in_progress"
-            assert "resumed_time" in data
-
-    def test_complete_exam_session_contract(self, test_client: TestClient):
-        """測試 POST /api/v1/exam-sessions/{session_id}/complete 契約"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-            response = test_client.post(f"/api/v1/exam-sessions/{session_id}/complete")
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "completed"
-            assert "end_time" in data
-            assert "final_score" in data
-            assert "results" in data
-
-    def test_exam_session_constraints_contract(self, test_client: TestClient):
-        """測試考試會話約束契約（單一活動會話限制）"""
-        with pytest.raises(NotImplementedError):
-            # 嘗試建立第二個會話應該失敗
-            session_data = {
-                "question_set_id": "test-ckad",
-                "vm_config_id": "test-cluster"
-            }
-            response = test_client.post("/api/v1/exam-sessions", json=session_data)
-            assert response.status_code == 409  # Conflict
-            data = response.json()
-            assert "error" in data
-            assert "active_session_id" in data
-
-    def test_exam_session_error_responses_contract(self, test_client: TestClient):
-        """測試考試會話錯誤回應契約"""
-        with pytest.raises(NotImplementedError):
-            # 404 錯誤 - 會話不存在
-            response = test_client.get("/api/v1/exam-sessions/non-existent")
-            assert response.status_code == 404
-
-            # 400 錯誤 - 無效狀態轉換
-            session_id = "test-session-001"
-            response = test_client.post(f"/api/v1/exam-sessions/{session_id}/start")
-            # 如果會話已經開始，再次啟動應該返回 400
-            assert response.status_code == 400
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+
+
+pytestmark = pytest.mark.skip(reason="等待 main.py 實作")
+
+
+def test_get_exam_sessions_contract(test_client: "TestClient"):
+    """測試 GET /api/v1/exam-sessions 契約"""
+    response = test_client.get("/api/v1/exam-sessions")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert isinstance(data, list)
+    if data:
+        session = data[0]
+        assert "id" in session
+        assert "question_set_id" in session
+        assert "vm_config_id" in session
+        assert "status" in session
+        assert "created_at" in session
+
+
+def test_create_exam_session_contract(test_client: "TestClient"):
+    """測試 POST /api/v1/exam-sessions 契約"""
+    session_data = {
+        "question_set_id": "test-ckad",
+        "vm_config_id": "test-cluster"
+    }
+    response = test_client.post("/api/v1/exam-sessions", json=session_data)
+    assert response.status_code == 201
+    data = orjson.loads(response.content)
+    assert "id" in data
+    assert data["question_set_id"] == session_data["question_set_id"]
+    assert data["vm_config_id"] == session_data["vm_config_id"]
+    assert data["status"] == "created"
+    assert data["current_question_index"] == 0
+
+
+def test_get_exam_session_by_id_contract(test_client: "TestClient"):
+    """測試 GET /api/v1/exam-sessions/{session_id} 契約"""
+    session_id = "test-session-001"
+    response = test_client.get(f"/api/v1/exam-sessions/{session_id}")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert data["id"] == session_id
+    assert "environment" in data
+    assert "current_question" in data
+    assert "progress" in data
+
+
+def test_update_exam_session_contract(test_client: "TestClient"):
+    """測試 PATCH /api/v1/exam-sessions/{session_id} 契約"""
+    session_id = "test-session-001"
+    update_data = {
+        "current_question_index": 1
+    }
+    response = test_client.patch(f"/api/v1/exam-sessions/{session_id}", json=update_data)
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert data["current_question_index"] == 1
+
+
+def test_start_exam_session_contract(test_client: "TestClient"):
+    """測試 POST /api/v1/exam-sessions/{session_id}/start 契約"""
+    session_id = "test-session-001"
+    response = test_client.post(f"/api/v1/exam-sessions/{session_id}/start")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert data["status"] == "in_progress"
+    assert "start_time" in data
+    assert data["start_time"] is not None
+
+
+def test_pause_exam_session_contract(test_client: "TestClient"):
+    """測試 POST /api/v1/exam-sessions/{session_id}/pause 契約"""
+    session_id = "test-session-001"
+    response = test_client.post(f"/api/v1/exam-sessions/{session_id}/pause")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert data["status"] == "paused"
+    assert "paused_time" in data
+
+
+def test_resume_exam_session_contract(test_client: "TestClient"):
+    """測試 POST /api/v1/exam-sessions/{session_id}/resume 契約"""
+    session_id = "test-session-001"
+    response = test_client.post(f"/api/v1/exam-sessions/{session_id}/resume")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert data["status"] == "in_progress"
+    assert "resumed_time" in data
+
+
+def test_complete_exam_session_contract(test_client: "TestClient"):
+    """測試 POST /api/v1/exam-sessions/{session_id}/complete 契約"""
+    session_id = "test-session-001"
+    response = test_client.post(f"/api/v1/exam-sessions/{session_id}/complete")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert data["status"] == "completed"
+    assert "end_time" in data
+    assert "final_score" in data
+    assert "results" in data
+
+
+def test_exam_session_constraints_contract(test_client: "TestClient"):
+    """測試考試會話約束契約（單一活動會話限制）"""
+    # 嘗試建立第二個會話應該失敗
+    session_data = {
+        "question_set_id": "test-ckad",
+        "vm_config_id": "test-cluster"
+    }
+    response = test_client.post("/api/v1/exam-sessions", json=session_data)
+    assert response.status_code == 409  # Conflict
+    data = orjson.loads(response.content)
+    assert "error" in data
+    assert "active_session_id" in data
+
+
+def test_exam_session_error_responses_contract(test_client: "TestClient"):
+    """測試考試會話錯誤回應契約"""
+    # 404 錯誤 - 會話不存在
+    response = test_client.get("/api/v1/exam-sessions/non-existent")
+    assert response.status_code == 404
+
+    # 400 錯誤 - 無效狀態轉換
+    session_id = "test-session-001"
+    response = test_client.post(f"/api/v1/exam-sessions/{session_id}/start")
+    # 如果會話已經開始，再次啟動應該返回 400
+    assert response.status_code == 400
\ No newline at end of file
@@ -2,103 +2,115 @@
 T011: 題組管理 API 契約測試
 測試題組管理相關的 API 端點契約
 """
+import fastjsonschema
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-
-
-class TestQuestionSetsContract:
-    """題組管理 API 契約測試"""
-
-    def test_get_question_sets_contract(self, test_client: TestClient):
-        """測試 GET /api/v1/question-sets 契約"""
-        with pytest.raises(NotImplementedError):
-            response = test_client.get("/api/v1/question-sets")
-            assert response.status_code == 200
-            data = response.json()
-            assert isinstance(data, list)
-            if data:
-                question_set = data[0]
-                assert "id" in question_set
-                assert "title" in question_set
-                assert "certification_type" in question_set
-                assert "difficulty" in question_set
-                assert "duration_minutes" in question_set
-                assert "total_questions" in question_set
-                assert "total_points" in question_set
-
-    def test_get_question_set_by_id_contract(self, test_client: TestClient):
-        """測試 GET /api/v1/question-sets/{set_id} 契約"""
-        with pytest.raises(NotImplementedError):
-            set_id = "test-ckad"
-            response = test_client.get(f"/api/v1/question-sets/{set_id}")
-            assert response.status_code == 200
-            data = response.json()
-            assert data["id"] == set_id
-            assert "metadata" in data
-            assert "questions" in data
-            assert isinstance(data["questions"], list)
-
-    def test_get_question_set_detailed_contract(self, test_client: TestClient):
-        """測試題組詳細資料契約"""
-        with pytest.raises(NotImplementedError):
-            set_id = "test-ckad"
-            response = test_client.get(f"/api/v1/question-sets/{set_id}")
-            data = response.json()
-
-            # 檢查 metadata 結構
-            metadata = data["metadata"]
-            assert "version" in metadata
-            assert "created_at" in metadata
-            assert "updated_at" in metadata
-            assert "tags" in metadata
-
-            # 檢查問題結構
-            if data["questions"]:
-                question = data["questions"][0]
-                assert "id" in question
-                assert "title" in question
-                assert "description" in question
-                assert "points" in question
-                assert "instructions" in question
-                assert "scoring" in question
-
-    def test_reload_question_sets_contract(self, test_client: TestClient):
-        """測試 POST /api/v1/question-sets/reload 契約"""
-        with pytest.raises(NotImplementedError):
-            response = test_client.post("/api/v1/question-sets/reload")
-            assert response.status_code == 200
-            data = response.json()
-            assert "success" in data
-            assert "reloaded_count" in data
-            assert "errors" in data
-            assert isinstance(data["errors"], list)
-
-    def test_question_set_filtering_contract(self, test_client: TestClient):
-        """測試題組篩選契約"""
-        with pytest.raises(NotImplementedError):
-            # 按認證類型篩選
-            response = test_client.get("/api/v1/question-sets?certification_type=CKAD")
-            assert response.status_code == 200
-            data = response.json()
-            for item in data:
-                assert item["certification_type"] == "CKAD"
-
-            # 按難度篩選
-            response = test_client.get("/api/v1/question-sets?difficulty=intermediate")
-            assert response.status_code == 200
-            data = response.json()
-            for item in data:
-                assert item["difficulty"] == "intermediate"
-
-    def test_question_set_error_responses_contract(self, test_client: TestClient):
-        """測試題組錯誤回應契約"""
-        with pytest.raises(NotImplementedError):
-            # 404 錯誤 - 題組不存在
-            response = test_client.get("/api/v1/question-sets/non-existent")
-            assert response.status_code == 404
-            data = response.json()
-            assert "error" in data
-            assert "message" in data
-
-            # 500 錯誤 - 檔案載入失敗
-            # 這個會在實際實作時測試檔案系統錯誤處理
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+
+# 回應結構驗證器（模組載入時編譯一次）
+_QUESTION_SET_SCHEMA = {
+    "type": "object",
+    "required": [
+        "id", "title", "certification_type", "difficulty",
+        "duration_minutes", "total_questions", "total_points"
+    ]
+}
+_QUESTION_SET_DETAIL_SCHEMA = {
+    "type": "object",
+    "required": ["metadata", "questions"],
+    "properties": {
+        "metadata": {
+            "type": "object",
+            "required": ["version", "created_at", "updated_at", "tags"]
+        },
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id", "title", "description", "points", "instructions", "scoring"]
+            }
+        }
+    }
+}
+_QUESTION_SET_CHECK = fastjsonschema.compile(_QUESTION_SET_SCHEMA)
+_QUESTION_SET_DETAIL_CHECK = fastjsonschema.compile(_QUESTION_SET_DETAIL_SCHEMA)
+
+
+pytestmark = pytest.mark.skip(reason="等待 main.py 實作")
+
+
+def test_get_question_sets_contract(test_client: "TestClient"):
+    """測試 GET /api/v1/question-sets 契約"""
+    response = test_client.get("/api/v1/question-sets")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert isinstance(data, list)
+    if data:
+        _QUESTION_SET_CHECK(data[0])
+
+
+def test_get_question_set_by_id_contract(test_client: "TestClient"):
+    """測試 GET /api/v1/question-sets/{set_id} 契約"""
+    set_id = "test-ckad"
+    response = test_client.get(f"/api/v1/question-sets/{set_id}")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert data["id"] == set_id
+    assert "metadata" in data
+    assert "questions" in data
+    assert isinstance(data["questions"], list)
+
+
+def test_get_question_set_detailed_contract(test_client: "TestClient"):
+    """測試題組詳細資料契約"""
+    set_id = "test-ckad"
+    response = test_client.get(f"/api/v1/question-sets/{set_id}")
+    data = orjson.loads(response.content)
+
+    # 檢查 metadata 與問題結構
+    _QUESTION_SET_DETAIL_CHECK(data)
+
+
+def test_reload_question_sets_contract(test_client: "TestClient"):
+    """測試 POST /api/v1/question-sets/reload 契約"""
+    response = test_client.post("/api/v1/question-sets/reload")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    assert "success" in data
+    assert "reloaded_count" in data
+    assert "errors" in data
+    assert isinstance(data["errors"], list)
+
+
+def test_question_set_filtering_contract(test_client: "TestClient"):
+    """測試題組篩選契約"""
+    get = test_client.get
+    # 按認證類型篩選
+    response = get("/api/v1/question-sets?certification_type=CKAD")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    for item in data:
+        assert item["certification_type"] == "CKAD"
+
+    # 按難度篩選
+    response = get("/api/v1/question-sets?difficulty=intermediate")
+    assert response.status_code == 200
+    data = orjson.loads(response.content)
+    for item in data:
+        assert item["difficulty"] == "intermediate"
+
+
+def test_question_set_error_responses_contract(test_client: "TestClient"):
+    """測試題組錯誤回應契約"""
+    # 404 錯誤 - 題組不存在
+    response = test_client.get("/api/v1/question-sets/non-existent")
+    assert response.status_code == 404
+    data = orjson.loads(response.content)
+    assert "error" in data
+    assert "message" in data
+
+    # 500 錯誤 - 檔案載入失敗
+    # 這個會在實際實作時測試檔案系統錯誤處理
\ No newline at end of file
@@ -2,162 +2,185 @@
 T016: 完整考試流程整合測試
 測試從建立考試會話到完成考試的完整流程
 """
+import asyncio
+from typing import TYPE_CHECKING
+
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-
-
-class TestExamFlowIntegration:
-    """完整考試流程整合測試"""
-
-    @pytest.mark.integration
-    def test_complete_exam_workflow(self, test_client: TestClient, mock_vm_config, mock_question_set):
-        """測試完整考試工作流程"""
-        with pytest.raises(NotImplementedError):
-            # 1. 建立 VM 配置
-            vm_response = test_client.post("/api/v1/vm-configs", json=mock_vm_config)
-            assert vm_response.status_code == 201
-            vm_config_id = vm_response.json()["id"]
-
-            # 2. 載入題組（檔案系統）
-            reload_response = test_client.post("/api/v1/question-sets/reload")
-            assert reload_response.status_code == 200
-
-            # 3. 建立考試會話
-            session_data = {
-                "question_set_id": mock_question_set["id"],
-                "vm_config_id": vm_config_id
-            }
-            session_response = test_client.post("/api/v1/exam-sessions", json=session_data)
-            assert session_response.status_code == 201
-            session_id = session_response.json()["id"]
-
-            # 4. 部署環境
-            provision_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/environment/provision")
-            assert provision_response.status_code == 202
-
-            # 5. 等待環境就緒（模擬）
-            status_response = test_client.get(f"/api/v1/exam-sessions/{session_id}/environment/status")
-            assert status_response.status_code == 200
-            # 在實際環境中這裡會輪詢直到就緒
-
-            # 6. 啟動考試
-            start_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/start")
-            assert start_response.status_code == 200
-
-            # 7. 建立 VNC 連線
-            vnc_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/vnc/token")
-            assert vnc_response.status_code == 201
-
-            # 8. 答題流程
-            question_id = "ckad-001"
-            submit_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/questions/{question_id}/submit")
-            assert submit_response.status_code == 200
-
-            # 9. 導航到下一題
-            nav_response = test_client.patch(
-                f"/api/v1/exam-sessions/{session_id}/navigation",
-                json={"action": "next"}
-            )
-            assert nav_response.status_code == 200
-
-            # 10. 完成考試
-            complete_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/complete")
-            assert complete_response.status_code == 200
-            final_data = complete_response.json()
-            assert "final_score" in final_data
-            assert "results" in final_data
-
-    @pytest.mark.integration
-    def test_exam_session_state_transitions(self, test_client: TestClient):
-        """測試考試會話狀態轉換"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-
-            # 狀態：created -> in_progress
-            start_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/start")
-            assert start_response.status_code == 200
-            assert start_response.json()["status"] == "in_progress"
-
-            # 狀態：in_progress -> paused
-            pause_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/pause")
-            assert pause_response.status_code == 200
-            assert pause_response.json()["status"] == "paused"
-
-            # 狀態：paused -> in_progress
-            resume_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/resume")
-            assert resume_response.status_code == 200
-            assert resume_response.json()["status"] == "in_progress"
-
-            # 狀態：in_progress -> completed
-            complete_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/complete")
-            assert complete_response.status_code == 200
-            assert complete_response.json()["status"] == "completed"
-
-    @pytest.mark.integration
-    def test_concurrent_session_limitation(self, test_client: TestClient):
-        """測試單一活動會話限制"""
-        with pytest.raises(NotImplementedError):
-            # 建立第一個會話
-            session_data = {
-                "question_set_id": "test-ckad",
-                "vm_config_id": "test-cluster"
-            }
-            response1 = test_client.post("/api/v1/exam-sessions", json=session_data)
-            assert response1.status_code == 201
-
-            # 嘗試建立第二個會話應該失敗
-            response2 = test_client.post("/api/v1/exam-sessions", json=session_data)
-            assert response2.status_code == 409  # Conflict
-            assert "active_session_id" in response2.json()
-
-    @pytest.mark.integration
-    def test_exam_timeout_handling(self, test_client: TestClient):
-        """測試考試逾時處理"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-
-            # 啟動考試
-            start_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/start")
-            assert start_response.status_code == 200
-
-            # 模擬逾時（在實際實作中會是背景任務）
-            # 檢查會話狀態是否自動轉為 timeout
-            status_response = test_client.get(f"/api/v1/exam-sessions/{session_id}")
-            # 這裡需要模擬時間流逝或手動觸發逾時
-
-    @pytest.mark.integration
-    def test_environment_failure_recovery(self, test_client: TestClient):
-        """測試環境部署失敗恢復"""
-        with pytest.raises(NotImplementedError):
-            session_id = "test-session-001"
-
-            # 嘗試部署環境（可能失敗）
-            provision_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/environment/provision")
-
-            # 檢查失敗狀態
-            status_response = test_client.get(f"/api/v1/exam-sessions/{session_id}/environment/status")
-            if status_response.json()["status"] == "failed":
-                # 重試部署
-                retry_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/environment/provision")
-                assert retry_response.status_code in [202, 409]  # 接受或衝突
-
-    @pytest.mark.integration
-    def test_data_persistence(self, test_client: TestClient):
-        """測試資料持久化"""
-        with pytest.raises(NotImplementedError):
-            # 建立會話和答題
-            session_id = "test-session-001"
-            question_id = "ckad-001"
-
-            # 提交答案
-            submit_response = test_client.post(f"/api/v1/exam-sessions/{session_id}/questions/{question_id}/submit")
-            assert submit_response.status_code == 200
-            original_score = submit_response.json()["score"]
-
-            # 重新啟動應用（模擬）
-            # 在實際測試中會重新建立 test_client
-
-            # 檢查資料是否持久化
-            status_response = test_client.get(f"/api/v1/exam-sessions/{session_id}/questions/{question_id}/status")
-            assert status_response.status_code == 200
-            assert status_response.json()["score"] == original_score
\ No newline at end of file
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+
+
+async def _request_json(client: "AsyncClient", method: str, path: str, expect: int = 200, body=None):
+    """送出請求、檢查狀態碼並回傳解析後的 JSON（無內容時回傳 None）"""
+    response = await client.request(method, path, json=body)
+    assert response.status_code == expect
+    return orjson.loads(response.content) if response.content else None
+
+
+# 測試用會話 ID
+_SID = "test-session-001"
+
+
+# 相依的端點尚未實作的測試
+_pending = pytest.mark.skip(reason="等待 API 實作")
+
+
+@_pending
+@pytest.mark.integration
+async def test_complete_exam_workflow(async_client: "AsyncClient", mock_vm_config, mock_question_set):
+    """測試完整考試工作流程"""
+    # 1. 建立 VM 配置、2. 載入題組（檔案系統），兩者互不相依可同時送出
+    vm_config, _ = await asyncio.gather(
+        _request_json(async_client, "POST", "/api/v1/vm-configs", 201, dict(mock_vm_config)),
+        _request_json(async_client, "POST", "/api/v1/question-sets/reload")
+    )
+    vm_config_id = vm_config["id"]
+
+    # 3. 建立考試會話
+    session_data = {
+        "question_set_id": mock_question_set["id"],
+        "vm_config_id": vm_config_id
+    }
+    session_id = (await _request_json(async_client, "POST", "/api/v1/exam-sessions", 201, session_data))["id"]
+    session_path = f"/api/v1/exam-sessions/{session_id}"
+
+    # 4. 部署環境
+    await _request_json(async_client, "POST", f"{session_path}/environment/provision", 202)
+
+    # 5. 等待環境就緒（模擬）
+    await _request_json(async_client, "GET", f"{session_path}/environment/status")
+    # 在實際環境中這裡會輪詢直到就緒
+
+    # 6. 啟動考試
+    await _request_json(async_client, "POST", f"{session_path}/start")
+
+    # 7. 建立 VNC 連線
+    await _request_json(async_client, "POST", f"{session_path}/vnc/token", 201)
+
+    # 8. 答題流程
+    question_id = "ckad-001"
+    await _request_json(async_client, "POST", f"{session_path}/questions/{question_id}/submit")
+
+    # 9. 導航到下一題
+    await _request_json(async_client, "PATCH", f"{session_path}/navigation", body={"action": "next"})
+
+    # 10. 完成考試
+    final_data = await _request_json(async_client, "POST", f"{session_path}/complete")
+    assert "final_score" in final_data
+    assert "results" in final_data
+
+
+@pytest.fixture
+def exam_session_service(app):
+    """以獨立的記憶體 SQLite 提供考試會話服務，每個測試案例的資料互不影響"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from src.api.v1.exam_sessions import get_exam_session_service
+    from src.models.exam_session import ExamSession
+    from src.services.exam_session_service import ExamSessionService
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    ExamSession.__table__.create(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    service = ExamSessionService(db)
+    app.dependency_overrides[get_exam_session_service] = lambda: service
+
+    yield service
+
+    app.dependency_overrides.pop(get_exam_session_service, None)
+    db.close()
+    engine.dispose()
+
+
+# 每個案例先以 setup 動作把新會話帶到起始狀態，再驗證單一轉換，不依賴案例執行順序
+@pytest.mark.integration
+@pytest.mark.parametrize("setup, action, expected_status", [
+    ((), "start", "in_progress"),
+    (("start",), "pause", "paused"),
+    (("start", "pause"), "resume", "in_progress"),
+    (("start",), "complete", "completed"),
+])
+async def test_exam_session_state_transitions(
+    async_client: "AsyncClient", exam_session_service, mock_question_set, mock_vm_config,
+    setup, action, expected_status
+):
+    """測試考試會話狀態轉換"""
+    session = await _request_json(async_client, "POST", "/api/v1/exam-sessions", 201, {
+        "question_set_id": mock_question_set["id"],
+        "vm_config_id": mock_vm_config["id"]
+    })
+    session_path = f"/api/v1/exam-sessions/{session['id']}"
+    for step in setup:
+        await _request_json(async_client, "POST", f"{session_path}/{step}")
+
+    data = await _request_json(async_client, "POST", f"{session_path}/{action}")
+    assert data["status"] == expected_status
+
+
+@_pending
+@pytest.mark.integration
+async def test_concurrent_session_limitation(async_client: "AsyncClient"):
+    """測試單一活動會話限制"""
+    # 建立第一個會話
+    session_data = {
+        "question_set_id": "test-ckad",
+        "vm_config_id": "test-cluster"
+    }
+    await _request_json(async_client, "POST", "/api/v1/exam-sessions", 201, session_data)
+
+    # 嘗試建立第二個會話應該失敗（Conflict）
+    conflict = await _request_json(async_client, "POST", "/api/v1/exam-sessions", 409, session_data)
+    assert "active_session_id" in conflict
+
+
+@_pending
+@pytest.mark.integration
+async def test_exam_timeout_handling(async_client: "AsyncClient"):
+    """測試考試逾時處理"""
+    # 啟動考試
+    start_response = await async_client.post(f"/api/v1/exam-sessions/{_SID}/start")
+    assert start_response.status_code == 200
+
+    # 模擬逾時（在實際實作中會是背景任務）
+    # 檢查會話狀態是否自動轉為 timeout
+    status_response = await async_client.get(f"/api/v1/exam-sessions/{_SID}")
+    # 這裡需要模擬時間流逝或手動觸發逾時
+
+
+@_pending
+@pytest.mark.integration
+async def test_environment_failure_recovery(async_client: "AsyncClient"):
+    """測試環境部署失敗恢復"""
+    # 嘗試部署環境（可能失敗）
+    provision_response = await async_client.post(f"/api/v1/exam-sessions/{_SID}/environment/provision")
+
+    # 檢查失敗狀態
+    status_response = await async_client.get(f"/api/v1/exam-sessions/{_SID}/environment/status")
+    if orjson.loads(status_response.content)["status"] == "failed":
+        # 重試部署
+        retry_response = await async_client.post(f"/api/v1/exam-sessions/{_SID}/environment/provision")
+        assert retry_response.status_code in [202, 409]  # 接受或衝突
+
+
+@_pending
+@pytest.mark.integration
+async def test_data_persistence(async_client: "AsyncClient"):
+    """測試資料持久化"""
+    # 建立會話和答題
+    question_id = "ckad-001"
+
+    # 提交答案
+    question_path = f"/api/v1/exam-sessions/{_SID}/questions/{question_id}"
+    original_score = (await _request_json(async_client, "POST", f"{question_path}/submit"))["score"]
+
+    # 重新啟動應用（模擬）
+    # 在實際測試中會重新建立測試客戶端
+
+    # 檢查資料是否持久化
+    assert (await _request_json(async_client, "GET", f"{question_path}/status"))["score"] == original_score
\ No newline at end of file
@@ -1,23 +0,0 @@
-"""
-T019: Kubespray 部署整合測試
-測試使用 Kubespray 自動部署 Kubernetes 叢集
-"""
-import pytest
-
-
-class TestKubesprayDeploymentIntegration:
-    """Kubespray 部署整合測試"""
-
-    @pytest.mark.integration
-    def test_kubespray_configuration_generation(self):
-        """測試 Kubespray 配置生成"""
-        with pytest.raises(NotImplementedError):
-            # TODO: 實作配置生成測試
-            pass
-
-    @pytest.mark.integration
-    def test_kubernetes_deployment_process(self):
-        """測試 Kubernetes 部署流程"""
-        with pytest.raises(NotImplementedError):
-            # TODO: 實作部署流程測試
-            pass
\ No newline at end of file
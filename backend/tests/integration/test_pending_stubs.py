@@ -0,0 +1,29 @@
+"""
+T017-T020: 待實作的整合測試
+VM 連線、題組檔案載入、Kubespray 部署與 VNC 容器的整合測試尚未實作，集中於此追蹤
+"""
+import pytest
+
+
+# 任務 ID 對應待實作的測試項目
+PENDING_TASKS = {
+    "T017_ssh": "SSH 連線驗證",
+    "T017_k8s": "Kubernetes 叢集存取",
+    "T018_json": "JSON 檔案載入",
+    "T018_watch": "檔案監控功能",
+    "T019_cfg": "Kubespray 配置生成",
+    "T019_deploy": "Kubernetes 部署流程",
+    "T020_vnc": "VNC 容器啟動",
+    "T020_bastion": "Bastion 容器整合",
+}
+
+# 待實作測試必定拋出 NotImplementedError；strict 讓意外通過的項目直接失敗，提醒移出此清單
+_pending = pytest.mark.xfail(reason="尚未實作", raises=NotImplementedError, strict=True)
+
+
+@pytest.mark.integration
+@_pending
+@pytest.mark.parametrize("task", list(PENDING_TASKS))
+def test_stub(task):
+    """待實作的整合測試"""
+    raise NotImplementedError(f"{task}: {PENDING_TASKS[task]}")
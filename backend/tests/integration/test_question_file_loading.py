@@ -1,23 +0,0 @@
-"""
-T018: 題組檔案載入整合測試
-測試題組 JSON 檔案的載入、監控和重載功能
-"""
-import pytest
-
-
-class TestQuestionFileLoadingIntegration:
-    """題組檔案載入整合測試"""
-
-    @pytest.mark.integration
-    def test_json_file_loading(self):
-        """測試 JSON 檔案載入"""
-        with pytest.raises(NotImplementedError):
-            # TODO: 實作檔案載入測試
-            pass
-
-    @pytest.mark.integration
-    def test_file_watcher_functionality(self):
-        """測試檔案監控功能"""
-        with pytest.raises(NotImplementedError):
-            # TODO: 實作檔案監控測試
-            pass
\ No newline at end of file
@@ -1,23 +0,0 @@
-"""
-T017: VM 連線測試整合測試
-測試與遠端 VM 的 SSH 連線和 Kubernetes 叢集通訊
-"""
-import pytest
-
-
-class TestVMConnectionIntegration:
-    """VM 連線整合測試"""
-
-    @pytest.mark.integration
-    def test_ssh_connection_validation(self):
-        """測試 SSH 連線驗證"""
-        with pytest.raises(NotImplementedError):
-            # TODO: 實作 SSH 連線測試
-            pass
-
-    @pytest.mark.integration
-    def test_kubernetes_cluster_access(self):
-        """測試 Kubernetes 叢集存取"""
-        with pytest.raises(NotImplementedError):
-            # TODO: 實作 K8s 叢集連線測試
-            pass
\ No newline at end of file
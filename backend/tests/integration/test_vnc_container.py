@@ -1,23 +0,0 @@
-"""
-T020: VNC 容器啟動整合測試
-測試 VNC 和 Bastion 容器的啟動、通訊和管理
-"""
-import pytest
-
-
-class TestVNCContainerIntegration:
-    """VNC 容器整合測試"""
-
-    @pytest.mark.integration
-    def test_vnc_container_startup(self):
-        """測試 VNC 容器啟動"""
-        with pytest.raises(NotImplementedError):
-            # TODO: 實作 VNC 容器啟動測試
-            pass
-
-    @pytest.mark.integration
-    def test_bastion_container_integration(self):
-        """測試 Bastion 容器整合"""
-        with pytest.raises(NotImplementedError):
-            # TODO: 實作 Bastion 容器測試
-            pass
\ No newline at end of file
@@ -5,94 +5,96 @@ T098: QuestionSetFileManager 單元測試
 
 import pytest
 import asyncio
-import json
-import tempfile
-import shutil
 from pathlib import Path
-from unittest.mock import Mock, patch, AsyncMock
-from typing import Dict, Any
+from unittest.mock import AsyncMock, Mock, patch
+from typing import Dict, Any, Tuple
 
-import sys
-sys.path.append("../../src")
+import orjson
+from watchfiles import Change
 
-from src.services.question_set_file_manager import QuestionSetFileManager
-from src.models.question_set_data import QuestionSetData, QuestionSetMetadata, QuestionData
+from src.services.question_set_file_manager import QuestionSetFileManager, _question_set_file_filter
+from src.models.question_set_data import QuestionSetData
+
+
+# 專案內附的題組目錄
+_BUNDLED_QUESTION_SETS = Path(__file__).resolve().parents[3] / "data" / "question_sets"
 
 
 class TestQuestionSetFileManager:
     """QuestionSetFileManager 測試類別"""
 
-    @pytest.fixture
-    async def temp_dir(self):
-        """建立臨時測試目錄"""
-        temp_path = tempfile.mkdtemp()
-        yield temp_path
-        shutil.rmtree(temp_path)
-
-    @pytest.fixture
-    async def sample_question_set_data(self) -> Dict[str, Any]:
-        """範例題組資料"""
+    @pytest.fixture(scope="session")
+    def sample_question_set_data(self) -> Dict[str, Any]:
+        """範例題組資料（整個 session 共用，測試不可修改；變體以 dict 展開另建）"""
         return {
             "metadata": {
                 "exam_type": "CKA",
                 "set_id": "test-001",
                 "name": "測試題組",
                 "description": "用於單元測試的題組",
-                "time_limit_minutes": 120,
-                "passing_score": 70.0,
-                "difficulty_level": "intermediate",
+                "time_limit": 120,
+                "passing_score": 70,
+                "difficulty": "medium",
                 "version": "1.0.0",
-                "created_at": "2025-09-24T08:00:00Z",
-                "updated_at": "2025-09-24T08:00:00Z",
                 "tags": ["test", "unit"]
             },
             "questions": [
                 {
-                    "id": 1,
-                    "content": "測試題目 1",
-                    "weight": 30.0,
-                    "kubernetes_objects": ["Pod"],
-                    "hints": ["提示 1"],
-                    "verification_scripts": ["test1.sh"],
-                    "preparation_scripts": []
+                    "id": "1",
+                    "context": "測試情境 1",
+                    "tasks": "建立 Pod",
+                    "notes": "",
+                    "verification": [
+                        {
+                            "id": "1",
+                            "description": "Pod 已建立",
+                            "verificationScriptFile": "q1_s1_validate_pod.sh",
+                            "expectedOutput": "0",
+                            "weightage": 2
+                        }
+                    ]
                 },
                 {
-                    "id": 2,
-                    "content": "測試題目 2",
-                    "weight": 70.0,
-                    "kubernetes_objects": ["Service", "Deployment"],
-                    "hints": ["提示 2", "提示 3"],
-                    "verification_scripts": ["test2.sh"],
-                    "preparation_scripts": ["setup2.sh"]
+                    "id": "2",
+                    "context": "測試情境 2",
+                    "tasks": "建立 Service 與 Deployment",
+                    "notes": "不要修改其他命名空間",
+                    "verification": [
+                        {
+                            "id": "1",
+                            "description": "Service 已建立",
+                            "verificationScriptFile": "q2_s1_validate_service.sh",
+                            "expectedOutput": "0",
+                            "weightage": 1
+                        },
+                        {
+                            "id": "2",
+                            "description": "Deployment 已建立",
+                            "verificationScriptFile": "q2_s2_validate_deployment.sh",
+                            "expectedOutput": "0",
+                            "weightage": 2
+                        }
+                    ]
                 }
             ]
         }
 
     @pytest.fixture
-    async def manager_with_temp_dir(self, temp_dir):
+    async def manager_with_temp_dir(self, tmp_path):
         """建立使用臨時目錄的管理器"""
-        manager = QuestionSetFileManager(base_dir=temp_dir)
+        manager = QuestionSetFileManager(base_dir=str(tmp_path))
         yield manager
-        # 清理
-        if manager._watcher_task and not manager._watcher_task.done():
-            manager._watcher_task.cancel()
-            try:
-                await manager._watcher_task
-            except asyncio.CancelledError:
-                pass
-
-    async def create_test_question_set(self, temp_dir: str, exam_type: str, set_id: str, data: Dict[str, Any]):
-        """建立測試題組檔案"""
-        set_path = Path(temp_dir) / exam_type / set_id
-        set_path.mkdir(parents=True, exist_ok=True)
+        # 清理：停止測試中啟動的檔案監控器
+        await manager.shutdown()
 
-        # 寫入 metadata.json
-        metadata_path = set_path / "metadata.json"
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(data["metadata"], f, ensure_ascii=False, indent=2)
+    @pytest.fixture(scope="session")
+    def sample_question_set_files(self, sample_question_set_data) -> Tuple[bytes, bytes]:
+        """範例題組序列化後的 (metadata.json, questions.json) 內容，整個 session 只序列化一次"""
+        return self.question_set_files(sample_question_set_data)
 
-        # 寫入 questions.json
-        questions_path = set_path / "questions.json"
+    @staticmethod
+    def question_set_files(data: Dict[str, Any]) -> Tuple[bytes, bytes]:
+        """將題組資料序列化為 (metadata.json, questions.json) 內容"""
         questions_data = {
             "set_info": {
                 "exam_type": data["metadata"]["exam_type"],
@@ -101,180 +103,205 @@ class TestQuestionSetFileManager:
             },
             "questions": data["questions"]
         }
-        with open(questions_path, 'w', encoding='utf-8') as f:
-            json.dump(questions_data, f, ensure_ascii=False, indent=2)
+        return (
+            orjson.dumps(data["metadata"], option=orjson.OPT_INDENT_2),
+            orjson.dumps(questions_data, option=orjson.OPT_INDENT_2)
+        )
+
+    async def create_test_question_set(self, tmp_path: Path, exam_type: str, set_id: str,
+                                       files: Tuple[bytes, bytes]):
+        """建立測試題組檔案（寫檔交給執行緒池，多個題組可用 asyncio.gather 並行建立）"""
+        set_path = tmp_path / exam_type / set_id
+        set_path.mkdir(parents=True, exist_ok=True)
+
+        # 寫入 metadata.json 與 questions.json
+        metadata_bytes, questions_bytes = files
+        await asyncio.gather(
+            asyncio.to_thread((set_path / "metadata.json").write_bytes, metadata_bytes),
+            asyncio.to_thread((set_path / "questions.json").write_bytes, questions_bytes)
+        )
 
         return set_path
 
+    def variant_files(self, data: Dict[str, Any], **metadata) -> Tuple[bytes, bytes]:
+        """以覆寫部分 metadata 的方式建立另一個題組的檔案內容"""
+        return self.question_set_files({**data, "metadata": {**data["metadata"], **metadata}})
+
     async def test_initialization(self, manager_with_temp_dir):
-        """測試管理器初始化"""
+        """測試管理器初始狀態"""
         manager = manager_with_temp_dir
 
-        # 測試初始狀態
-        assert manager.base_dir.exists() or not manager.base_dir.exists()  # 可能存在或不存在
-        assert len(manager._question_sets) == 0
-        assert len(manager._file_timestamps) == 0
-        assert manager._watcher_task is None
+        assert (len(manager._question_sets), len(manager._file_timestamps), manager._watcher_task) == (0, 0, None)
 
-    async def test_load_question_sets_empty_directory(self, manager_with_temp_dir):
-        """測試載入空目錄"""
+    async def test_initialize_loads_and_starts_watcher(self, manager_with_temp_dir, tmp_path,
+                                                       sample_question_set_files):
+        """測試 initialize 會載入題組並啟動檔案監控器"""
         manager = manager_with_temp_dir
+        await self.create_test_question_set(tmp_path, "cka", "test-001", sample_question_set_files)
+
         await manager.initialize()
 
-        question_sets = await manager.load_question_sets()
-        assert len(question_sets) == 0
+        assert manager.get_question_set("cka-test-001") is not None
+        assert manager._watcher_task is not None and not manager._watcher_task.done()
 
-    async def test_load_single_question_set(self, manager_with_temp_dir, temp_dir, sample_question_set_data):
-        """測試載入單一題組"""
+    async def test_load_question_sets_empty_directory(self, manager_with_temp_dir):
+        """測試載入空目錄"""
         manager = manager_with_temp_dir
 
-        # 建立測試題組
-        await self.create_test_question_set(temp_dir, "cka", "test-001", sample_question_set_data)
+        results = await manager.load_all_question_sets()
 
-        await manager.initialize()
-        question_sets = await manager.load_question_sets()
+        assert results == {"loaded": [], "errors": []}
 
-        assert len(question_sets) == 1
-        assert "cka/test-001" in question_sets
+    async def test_load_question_sets_missing_directory(self, tmp_path):
+        """測試題組目錄不存在時回傳空結果"""
+        manager = QuestionSetFileManager(base_dir=str(tmp_path / "missing"))
 
-        question_set = question_sets["cka/test-001"]
-        assert isinstance(question_set, QuestionSetData)
-        assert question_set.metadata.exam_type == "CKA"
-        assert question_set.metadata.set_id == "test-001"
-        assert question_set.metadata.name == "測試題組"
-        assert len(question_set.questions) == 2
+        assert await manager.load_all_question_sets() == {"loaded": [], "errors": []}
 
-    async def test_load_multiple_question_sets(self, manager_with_temp_dir, temp_dir, sample_question_set_data):
-        """測試載入多個題組"""
+    async def test_load_single_question_set(self, manager_with_temp_dir, tmp_path, sample_question_set_files):
+        """測試載入單一題組"""
         manager = manager_with_temp_dir
 
-        # 建立多個測試題組
-        await self.create_test_question_set(temp_dir, "cka", "test-001", sample_question_set_data)
-
-        # 建立第二個題組
-        data2 = sample_question_set_data.copy()
-        data2["metadata"]["set_id"] = "test-002"
-        data2["metadata"]["name"] = "測試題組 2"
-        await self.create_test_question_set(temp_dir, "cka", "test-002", data2)
+        # 建立測試題組
+        await self.create_test_question_set(tmp_path, "cka", "test-001", sample_question_set_files)
 
-        # 建立 CKAD 題組
-        data3 = sample_question_set_data.copy()
-        data3["metadata"]["exam_type"] = "CKAD"
-        data3["metadata"]["set_id"] = "test-003"
-        data3["metadata"]["name"] = "CKAD 測試題組"
-        await self.create_test_question_set(temp_dir, "ckad", "test-003", data3)
+        results = await manager.load_all_question_sets()
 
-        await manager.initialize()
-        question_sets = await manager.load_question_sets()
+        assert results == {"loaded": ["cka-test-001"], "errors": []}
 
-        assert len(question_sets) == 3
-        assert "cka/test-001" in question_sets
-        assert "cka/test-002" in question_sets
-        assert "ckad/test-003" in question_sets
+        question_set = manager.get_question_set("cka-test-001")
+        assert isinstance(question_set, QuestionSetData)
+        metadata = question_set.metadata
+        assert (metadata.exam_type, metadata.set_id, metadata.name, len(question_set.questions)) == (
+            "CKA", "test-001", "測試題組", 2
+        )
 
-    async def test_get_question_set_existing(self, manager_with_temp_dir, temp_dir, sample_question_set_data):
-        """測試取得存在的題組"""
+    async def test_load_multiple_question_sets(self, manager_with_temp_dir, tmp_path,
+                                               sample_question_set_data, sample_question_set_files):
+        """測試載入多個題組"""
         manager = manager_with_temp_dir
-        await self.create_test_question_set(temp_dir, "cka", "test-001", sample_question_set_data)
 
-        await manager.initialize()
-        await manager.load_question_sets()
-
-        question_set = await manager.get_question_set("cka/test-001")
-        assert question_set is not None
-        assert question_set.metadata.set_id == "test-001"
+        # 建立多個測試題組：第二個 CKA 題組與 CKAD 題組各自使用獨立的 metadata
+        await asyncio.gather(
+            self.create_test_question_set(tmp_path, "cka", "test-001", sample_question_set_files),
+            self.create_test_question_set(
+                tmp_path, "cka", "test-002",
+                self.variant_files(sample_question_set_data, set_id="test-002", name="測試題組 2")
+            ),
+            self.create_test_question_set(
+                tmp_path, "ckad", "test-003",
+                self.variant_files(sample_question_set_data, exam_type="CKAD", set_id="test-003",
+                                   name="CKAD 測試題組")
+            )
+        )
+
+        results = await manager.load_all_question_sets()
+
+        assert sorted(results["loaded"]) == ["cka-test-001", "cka-test-002", "ckad-test-003"]
+        assert sorted(manager.get_all_question_sets()) == ["cka-test-001", "cka-test-002", "ckad-test-003"]
 
     async def test_get_question_set_not_existing(self, manager_with_temp_dir):
         """測試取得不存在的題組"""
         manager = manager_with_temp_dir
-        await manager.initialize()
+        await manager.load_all_question_sets()
 
-        question_set = await manager.get_question_set("nonexistent/set")
-        assert question_set is None
+        assert manager.get_question_set("cka-nonexistent") is None
 
-    async def test_list_question_sets_by_exam_type(self, manager_with_temp_dir, temp_dir, sample_question_set_data):
-        """測試按考試類型列出題組"""
+    async def test_list_question_sets_by_certification_type(self, manager_with_temp_dir, tmp_path,
+                                                            sample_question_set_data, sample_question_set_files):
+        """測試按認證類型列出題組"""
         manager = manager_with_temp_dir
 
         # 建立不同類型的題組
-        await self.create_test_question_set(temp_dir, "cka", "test-001", sample_question_set_data)
-
-        data2 = sample_question_set_data.copy()
-        data2["metadata"]["exam_type"] = "CKAD"
-        data2["metadata"]["set_id"] = "test-002"
-        await self.create_test_question_set(temp_dir, "ckad", "test-002", data2)
-
-        await manager.initialize()
-        await manager.load_question_sets()
-
-        # 測試列出 CKA 題組
-        cka_sets = await manager.list_question_sets_by_exam_type("CKA")
-        assert len(cka_sets) == 1
-        assert cka_sets[0].metadata.exam_type == "CKA"
-
-        # 測試列出 CKAD 題組
-        ckad_sets = await manager.list_question_sets_by_exam_type("CKAD")
-        assert len(ckad_sets) == 1
-        assert ckad_sets[0].metadata.exam_type == "CKAD"
-
-        # 測試不存在的考試類型
-        cks_sets = await manager.list_question_sets_by_exam_type("CKS")
-        assert len(cks_sets) == 0
-
-    async def test_reload_question_sets(self, manager_with_temp_dir, temp_dir, sample_question_set_data):
+        await asyncio.gather(
+            self.create_test_question_set(tmp_path, "cka", "test-001", sample_question_set_files),
+            self.create_test_question_set(
+                tmp_path, "ckad", "test-002",
+                self.variant_files(sample_question_set_data, exam_type="CKAD", set_id="test-002")
+            )
+        )
+        await manager.load_all_question_sets()
+
+        # 認證類型比對不分大小寫
+        assert [s.id for s in manager.list_question_sets("CKA")] == ["cka-test-001"]
+        assert [s.id for s in manager.list_question_sets("ckad")] == ["ckad-test-002"]
+        assert manager.list_question_sets("CKS") == []
+        assert len(manager.list_question_sets()) == 2
+
+    async def test_reload_question_sets(self, manager_with_temp_dir, tmp_path,
+                                        sample_question_set_data, sample_question_set_files):
         """測試重新載入題組"""
         manager = manager_with_temp_dir
-        await self.create_test_question_set(temp_dir, "cka", "test-001", sample_question_set_data)
+        await self.create_test_question_set(tmp_path, "cka", "test-001", sample_question_set_files)
 
-        await manager.initialize()
-        initial_sets = await manager.load_question_sets()
-        assert len(initial_sets) == 1
+        initial = await manager.load_all_question_sets()
+        assert initial["loaded"] == ["cka-test-001"]
 
         # 新增另一個題組
-        data2 = sample_question_set_data.copy()
-        data2["metadata"]["set_id"] = "test-002"
-        await self.create_test_question_set(temp_dir, "cka", "test-002", data2)
+        await self.create_test_question_set(
+            tmp_path, "cka", "test-002", self.variant_files(sample_question_set_data, set_id="test-002")
+        )
 
         # 重新載入
-        reloaded_sets = await manager.reload_question_sets()
-        assert len(reloaded_sets) == 2
-        assert "cka/test-002" in reloaded_sets
-
-    async def test_file_validation_invalid_json(self, manager_with_temp_dir, temp_dir):
-        """測試無效 JSON 檔案處理"""
-        manager = manager_with_temp_dir
-
-        # 建立無效的 JSON 檔案
-        set_path = Path(temp_dir) / "cka" / "invalid-set"
-        set_path.mkdir(parents=True)
-
-        metadata_path = set_path / "metadata.json"
-        with open(metadata_path, 'w') as f:
-            f.write("invalid json content")
+        reloaded = await manager.reload_question_sets()
+        assert sorted(reloaded["loaded"]) == ["cka-test-001", "cka-test-002"]
+        assert manager.get_question_set("cka-test-002") is not None
 
-        await manager.initialize()
-        question_sets = await manager.load_question_sets()
+    async def test_load_bundled_question_set(self):
+        """測試載入專案內附的題組：驗證結果與原始 JSON 內容一致，questions.json 的其他欄位被忽略"""
+        set_dir = _BUNDLED_QUESTION_SETS / "cks" / "001"
+        manager = QuestionSetFileManager(base_dir=str(_BUNDLED_QUESTION_SETS))
 
-        # 應該跳過無效檔案
-        assert len(question_sets) == 0
+        question_set = await manager._load_question_set(set_dir, "CKS", "001")
 
-    async def test_file_validation_missing_questions_file(self, manager_with_temp_dir, temp_dir, sample_question_set_data):
+        raw_metadata = orjson.loads((set_dir / "metadata.json").read_bytes())
+        raw_questions = orjson.loads((set_dir / "questions.json").read_bytes())["questions"]
+        assert isinstance(question_set, QuestionSetData)
+        assert (question_set.id, question_set.exam_type, question_set.set_id) == ("cks-001", "CKS", "001")
+        assert question_set.metadata.model_dump(include=set(raw_metadata)) == raw_metadata
+        assert [question.model_dump() for question in question_set.questions] == raw_questions
+        assert question_set.file_paths["questions"] == str(set_dir / "questions.json")
+        assert question_set.loaded_at is not None and question_set.file_modified_at is not None
+
+    @pytest.mark.parametrize("metadata_bytes, questions_bytes", [
+        (b"invalid json content", b'{"questions": []}'),
+        (b'{"exam_type": "CKA"}', b'{"questions": []}'),
+        (None, b'{"questions": [{"id": 1}]}'),
+        (None, b'{"set_info": {}}'),
+    ], ids=["metadata-not-json", "metadata-missing-fields", "question-missing-fields", "questions-missing"])
+    async def test_invalid_file_reported_in_errors(self, manager_with_temp_dir, tmp_path,
+                                                   sample_question_set_files, metadata_bytes, questions_bytes):
+        """測試無法解析或驗證失敗的題組檔案記錄在 errors，其他題組仍正常載入"""
+        manager = manager_with_temp_dir
+        await asyncio.gather(
+            self.create_test_question_set(tmp_path, "cka", "test-001", sample_question_set_files),
+            self.create_test_question_set(
+                tmp_path, "cka", "invalid-set", (metadata_bytes or sample_question_set_files[0], questions_bytes)
+            )
+        )
+
+        results = await manager.load_all_question_sets()
+
+        assert results["loaded"] == ["cka-test-001"]
+        assert len(results["errors"]) == 1
+        assert results["errors"][0].startswith("載入題組失敗 CKA/invalid-set: ")
+        assert manager.get_question_set("cka-invalid-set") is None
+
+    async def test_file_validation_missing_questions_file(self, manager_with_temp_dir, tmp_path,
+                                                          sample_question_set_files):
         """測試缺少題目檔案的處理"""
         manager = manager_with_temp_dir
 
         # 只建立 metadata.json，不建立 questions.json
-        set_path = Path(temp_dir) / "cka" / "incomplete-set"
+        set_path = tmp_path / "cka" / "incomplete-set"
         set_path.mkdir(parents=True)
+        await asyncio.to_thread((set_path / "metadata.json").write_bytes, sample_question_set_files[0])
 
-        metadata_path = set_path / "metadata.json"
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(sample_question_set_data["metadata"], f, ensure_ascii=False)
-
-        await manager.initialize()
-        question_sets = await manager.load_question_sets()
+        results = await manager.load_all_question_sets()
 
-        # 應該跳過不完整的題組
-        assert len(question_sets) == 0
+        # 應該跳過不完整的題組並記錄錯誤
+        assert results["loaded"] == []
+        assert [error.split(":")[0] for error in results["errors"]] == ["找不到 questions.json"]
 
     async def test_callback_registration(self, manager_with_temp_dir):
         """測試回調函數註冊"""
@@ -283,113 +310,137 @@ class TestQuestionSetFileManager:
         callback1 = Mock()
         callback2 = Mock()
 
-        manager.add_callback(callback1)
-        manager.add_callback(callback2)
+        manager.add_change_callback(callback1)
+        manager.add_change_callback(callback2)
 
-        assert len(manager._callbacks) == 2
-        assert callback1 in manager._callbacks
-        assert callback2 in manager._callbacks
+        assert manager._callbacks == {callback1, callback2}
 
-        # 測試移除回調
-        manager.remove_callback(callback1)
-        assert len(manager._callbacks) == 1
-        assert callback2 in manager._callbacks
+        # 測試移除回調；移除不存在的回調不會拋出例外
+        manager.remove_change_callback(callback1)
+        manager.remove_change_callback(callback1)
+        assert manager._callbacks == {callback2}
 
-    @patch('src.services.question_set_file_manager.watch')
-    async def test_file_monitoring_start_stop(self, mock_watch, manager_with_temp_dir):
+    async def test_file_watcher_start_shutdown(self, manager_with_temp_dir):
         """測試檔案監控啟動和停止"""
         manager = manager_with_temp_dir
+        started = asyncio.Event()
 
-        # 模擬 watch 函數
-        mock_watch.return_value = AsyncMock()
+        async def fake_awatch(*args, **kwargs):
+            """模擬 awatch：不產生任何變更，直到被取消"""
+            started.set()
+            await asyncio.Event().wait()
+            yield set()
 
-        await manager.start_monitoring()
-        assert manager._watcher_task is not None
-        assert not manager._watcher_task.done()
+        with patch('src.services.question_set_file_manager.awatch', fake_awatch):
+            await manager.start_file_watcher()
+            await asyncio.wait_for(started.wait(), timeout=1)
+            assert not manager._watcher_task.done()
 
-        await manager.stop_monitoring()
-        assert manager._watcher_task is None or manager._watcher_task.done()
+            await manager.shutdown()
+            assert manager._watcher_task.cancelled()
 
-    async def test_cleanup(self, manager_with_temp_dir):
-        """測試清理資源"""
+    async def test_file_change_reloads_and_notifies(self, manager_with_temp_dir, tmp_path,
+                                                    sample_question_set_data, sample_question_set_files):
+        """測試題組檔案變更時重新載入並通知回調"""
         manager = manager_with_temp_dir
-        await manager.initialize()
+        set_path = await self.create_test_question_set(tmp_path, "cka", "test-001", sample_question_set_files)
+        await manager.load_all_question_sets()
+        old_set = manager.get_question_set("cka-test-001")
 
-        # 新增一些資料和回調
-        manager._question_sets["test"] = Mock()
-        manager.add_callback(Mock())
+        callback = AsyncMock()
+        manager.add_change_callback(callback)
 
-        await manager.cleanup()
+        # 修改題組名稱後送出變更事件
+        metadata_bytes, _ = self.variant_files(sample_question_set_data, name="更新後的題組")
+        await asyncio.to_thread((set_path / "metadata.json").write_bytes, metadata_bytes)
+        await manager._handle_file_changes({(2, str(set_path / "metadata.json"))})
 
-        # 驗證清理結果
-        assert len(manager._question_sets) == 0
-        assert len(manager._callbacks) == 0
+        new_set = manager.get_question_set("cka-test-001")
+        assert new_set.metadata.name == "更新後的題組"
+        callback.assert_awaited_once_with("cka-test-001", old_set, new_set)
 
-    async def test_error_handling_invalid_metadata_structure(self, manager_with_temp_dir, temp_dir):
-        """測試無效 metadata 結構的錯誤處理"""
+    async def test_get_stats(self, manager_with_temp_dir, tmp_path, sample_question_set_files):
+        """測試統計資訊"""
         manager = manager_with_temp_dir
+        await self.create_test_question_set(tmp_path, "cka", "test-001", sample_question_set_files)
+        await manager.load_all_question_sets()
 
-        # 建立結構不完整的 metadata
-        set_path = Path(temp_dir) / "cka" / "invalid-metadata"
-        set_path.mkdir(parents=True)
+        stats = manager.get_stats()
 
-        metadata_path = set_path / "metadata.json"
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump({"invalid": "structure"}, f)
+        assert (stats["total_question_sets"], stats["total_questions"],
+                stats["by_certification_type"], stats["by_difficulty"]) == (1, 2, {"CKA": 1}, {"medium": 1})
 
-        questions_path = set_path / "questions.json"
-        with open(questions_path, 'w', encoding='utf-8') as f:
-            json.dump({"questions": []}, f)
+    async def test_error_handling_invalid_metadata_structure(self, manager_with_temp_dir, tmp_path):
+        """測試無效 metadata 結構的錯誤處理"""
+        manager = manager_with_temp_dir
 
-        await manager.initialize()
-        question_sets = await manager.load_question_sets()
+        # 建立結構不完整的 metadata
+        await self.create_test_question_set(
+            tmp_path, "cka", "invalid-metadata",
+            (orjson.dumps({"invalid": "structure"}), orjson.dumps({"questions": []}))
+        )
+
+        results = await manager.load_all_question_sets()
 
         # 應該跳過結構無效的題組
-        assert len(question_sets) == 0
+        assert (results["loaded"], len(results["errors"])) == ([], 1)
 
-    async def test_concurrent_access(self, manager_with_temp_dir, temp_dir, sample_question_set_data):
+    async def test_concurrent_access(self, manager_with_temp_dir, tmp_path, sample_question_set_files):
         """測試並發存取"""
         manager = manager_with_temp_dir
-        await self.create_test_question_set(temp_dir, "cka", "test-001", sample_question_set_data)
-        await manager.initialize()
-
-        # 同時執行多個操作
-        tasks = [
-            manager.load_question_sets(),
-            manager.get_question_set("cka/test-001"),
-            manager.list_question_sets_by_exam_type("CKA"),
-            manager.reload_question_sets()
-        ]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # 檢查沒有異常
-        for result in results:
-            assert not isinstance(result, Exception)
-
-    async def test_memory_usage_optimization(self, manager_with_temp_dir, temp_dir, sample_question_set_data):
-        """測試記憶體使用最佳化"""
+        await self.create_test_question_set(tmp_path, "cka", "test-001", sample_question_set_files)
+
+        # 同時執行多個載入操作
+        results = await asyncio.gather(
+            manager.load_all_question_sets(),
+            manager.reload_question_sets(),
+            manager.load_all_question_sets(),
+            return_exceptions=True
+        )
+
+        # 檢查沒有異常，最終狀態一致
+        assert [result["loaded"] for result in results] == [["cka-test-001"]] * 3
+        assert list(manager.get_all_question_sets()) == ["cka-test-001"]
+
+    async def test_memory_usage_optimization(self, manager_with_temp_dir, tmp_path, sample_question_set_data):
+        """測試重新載入不會累積題組"""
         manager = manager_with_temp_dir
 
-        # 建立大量題組測試記憶體使用
-        for i in range(10):
-            data = sample_question_set_data.copy()
-            data["metadata"]["set_id"] = f"test-{i:03d}"
-            await self.create_test_question_set(temp_dir, "cka", f"test-{i:03d}", data)
-
-        await manager.initialize()
-        question_sets = await manager.load_question_sets()
+        # 建立大量題組（每個題組使用獨立的 metadata，並行建立）
+        await asyncio.gather(*[
+            self.create_test_question_set(
+                tmp_path, "cka", f"test-{i:03d}",
+                self.variant_files(sample_question_set_data, set_id=f"test-{i:03d}")
+            )
+            for i in range(10)
+        ])
 
-        assert len(question_sets) == 10
+        results = await manager.load_all_question_sets()
+        assert len(results["loaded"]) == 10
 
         # 測試重新載入不會造成記憶體洩漏
         for _ in range(3):
             await manager.reload_question_sets()
 
         # 驗證最終狀態
-        final_sets = await manager.load_question_sets()
-        assert len(final_sets) == 10
+        assert (len(manager.get_all_question_sets()), len(manager._file_timestamps)) == (10, 20)
+
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/data/question_sets/cka/001/metadata.json", True),
+    ("/data/question_sets/cka/001/questions.json", True),
+    ("questions.json", True),
+    ("/data/question_sets/cka/001/scripts/q1_s1_validate.sh", False),
+    ("/data/question_sets/cka/001/.questions.json.swp", False),
+    ("/data/question_sets/cka/001/questions.json~", False),
+    ("/data/question_sets/cka/001/example.md", False),
+    ("/data/question_sets/cka/001", False),
+])
+def test_question_set_file_filter(path, expected):
+    """測試 awatch 過濾器只接受 metadata.json 與 questions.json"""
+    assert _question_set_file_filter(Change.modified, path) is expected
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
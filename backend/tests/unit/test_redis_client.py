@@ -0,0 +1,98 @@
+"""
+Redis 客戶端單元測試
+測試連線失敗時改用 NullRedis，並依退避時間重新連線
+"""
+
+import pytest
+
+from src.cache import redis_client as redis_module
+
+
+class _FakeClock:
+    """可手動推進的 time.monotonic 替代品"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = _FakeClock()
+    monkeypatch.setattr(redis_module.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+@pytest.fixture
+def connect_results(monkeypatch):
+    """依序回傳 redis_client.connect() 的結果，並記錄呼叫次數"""
+    results = []
+    calls = []
+
+    def fake_connect():
+        calls.append(None)
+        redis_module.redis_client.connected = results.pop(0)
+        return redis_module.redis_client.connected
+
+    monkeypatch.setattr(redis_module.redis_client, "connect", fake_connect)
+    monkeypatch.setattr(redis_module.redis_client, "connected", False)
+    monkeypatch.setattr(redis_module, "_active_client", redis_module.null_redis)
+    monkeypatch.setattr(redis_module, "_next_reconnect_at", 0.0)
+    monkeypatch.setattr(redis_module, "_reconnect_delay", 1.0)
+    monkeypatch.setattr(redis_module, "REDIS_RECONNECT_MIN_DELAY", 1.0)
+    monkeypatch.setattr(redis_module, "REDIS_RECONNECT_MAX_DELAY", 4.0)
+    return results, calls
+
+
+class TestRedisReconnect:
+    """Redis 重新連線測試類別"""
+
+    def test_startup_failure_falls_back_with_warning(self, clock, connect_results, caplog):
+        """測試啟動時連線失敗改用 NullRedis 並記錄警告"""
+        results, _ = connect_results
+        results.append(False)
+
+        assert redis_module.connect_redis() is False
+
+        assert redis_module._active_client is redis_module.null_redis
+        assert "NullRedis" in caplog.text
+
+    def test_reconnects_after_backoff(self, clock, connect_results):
+        """測試退避時間到達前不重試，到達後重新連線成功即改回 RedisClient"""
+        results, calls = connect_results
+        results.extend([False, True])
+        redis_module.connect_redis()
+
+        clock.now += 0.5
+        assert redis_module.get_redis() is redis_module.null_redis
+        assert len(calls) == 1
+
+        clock.now += 0.5
+        assert redis_module.get_redis() is redis_module.redis_client
+        assert len(calls) == 2
+
+    def test_backoff_doubles_up_to_max(self, clock, connect_results):
+        """測試每次重新連線失敗時退避時間加倍，且不超過上限"""
+        results, calls = connect_results
+        results.extend([False] * 5)
+        redis_module.connect_redis()
+
+        for delay in (1.0, 2.0, 4.0, 4.0):
+            clock.now += delay - 0.1
+            assert redis_module.get_redis() is redis_module.null_redis
+            clock.now += 0.1
+            assert redis_module.get_redis() is redis_module.null_redis
+
+        assert len(calls) == 5
+
+    def test_connected_client_does_not_reconnect(self, clock, connect_results):
+        """測試已連線時 get_redis() 不再嘗試連線"""
+        results, calls = connect_results
+        results.append(True)
+        redis_module.connect_redis()
+
+        clock.now += 100
+        assert redis_module.get_redis() is redis_module.redis_client
+        assert len(calls) == 1
@@ -12,9 +12,6 @@ from unittest.mock import Mock, AsyncMock, patch, mock_open
 from typing import Dict, Any, List
 from pathlib import Path
 
-import sys
-sys.path.append("../../src")
-
 from src.services.scoring_service import ScoringService
 from src.models.exam_session import ExamSession, ExamSessionStatus
 from src.models.question_set_data import QuestionSetData, QuestionSetMetadata, QuestionData
@@ -0,0 +1,97 @@
+"""
+TTLCache 單元測試
+測試存活時間、LRU 淘汰與移除行為
+"""
+
+import pytest
+
+from src.cache.ttl_cache import TTLCache
+
+
+class _FakeClock:
+    """可手動推進的單調時鐘"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return _FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return TTLCache(maxsize=3, ttl=60, clock=clock)
+
+
+class TestTTLCache:
+    """TTLCache 測試類別"""
+
+    def test_get_missing_key(self, cache):
+        """測試讀取不存在的鍵返回 None"""
+        assert cache.get("missing") is None
+
+    def test_get_before_expiry(self, cache, clock):
+        """測試存活時間內可讀取"""
+        cache.set("token", "session-1")
+        clock.advance(59.9)
+
+        assert cache.get("token") == "session-1"
+
+    def test_expires_after_ttl(self, cache, clock):
+        """測試到達存活時間後返回 None 並移除項目"""
+        cache.set("token", "session-1")
+        clock.advance(60)
+
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_set_rearms_ttl(self, cache, clock):
+        """測試重新寫入會重新計算存活時間"""
+        cache.set("token", "session-1")
+        clock.advance(50)
+        cache.set("token", "session-2")
+        clock.advance(50)
+
+        assert cache.get("token") == "session-2"
+
+    def test_evicts_least_recently_set(self, cache):
+        """測試超過容量時淘汰最早寫入的項目"""
+        for key in ("a", "b", "c", "d"):
+            cache.set(key, key.upper())
+
+        assert len(cache) == 3
+        assert cache.get("a") is None
+        assert [cache.get(key) for key in ("b", "c", "d")] == ["B", "C", "D"]
+
+    def test_get_marks_recently_used(self, cache):
+        """測試讀取會更新使用順序，淘汰的是最久未使用的項目"""
+        for key in ("a", "b", "c"):
+            cache.set(key, key.upper())
+        cache.get("a")
+        cache.set("d", "D")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+
+    def test_pop_removes_key(self, cache):
+        """測試移除既有項目"""
+        cache.set("token", "session-1")
+        cache.pop("token")
+
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_pop_missing_key(self, cache):
+        """測試移除不存在的鍵不會拋出例外"""
+        cache.set("token", "session-1")
+        cache.pop("missing")
+
+        assert len(cache) == 1
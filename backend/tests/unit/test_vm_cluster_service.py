@@ -11,9 +11,6 @@ import json
 import tempfile
 from pathlib import Path
 
-import sys
-sys.path.append("../../src")
-
 from src.services.vm_cluster_service import VMClusterService
 from src.models.vm_cluster_config import VMClusterConfig
 from src.services.vnc_container_service import VNCContainerService
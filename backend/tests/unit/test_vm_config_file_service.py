@@ -0,0 +1,74 @@
+"""
+VMConfigFileService 單元測試
+比對 ijson 串流解析與完整解析取得的配置名稱與節點數量
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.services.vm_config_file_service import VMConfigFileService
+
+_BUNDLED_VM_CONFIGS = Path(__file__).resolve().parents[3] / "data" / "vm_configs"
+
+
+def _full_parse_metadata(config_path: Path):
+    """完整解析的結果（串流解析前的語意）"""
+    content = json.loads(config_path.read_text(encoding="utf-8"))
+    return content.get("name", config_path.stem), len(content.get("nodes", []))
+
+
+@pytest.fixture
+def service(tmp_path):
+    return VMConfigFileService(base_dir=str(tmp_path))
+
+
+@pytest.mark.parametrize(
+    "config_path", sorted(_BUNDLED_VM_CONFIGS.glob("*.json")), ids=lambda path: path.name
+)
+def test_bundled_config_matches_full_parse(service, config_path):
+    """測試內建配置的串流解析結果與完整解析相同"""
+    assert service._read_config_metadata(config_path) == _full_parse_metadata(config_path)
+
+
+@pytest.mark.parametrize("content", [
+    {"name": "cluster", "nodes": [{"name": "a"}, {"name": "b"}]},
+    {"name": "cluster", "nodes": ["a", 1, None, [], [{"name": "nested"}]]},
+    {"name": "cluster", "nodes": []},
+    {"name": "cluster", "nodes": {"item": {"name": "a"}, "other": {}}},
+    {"name": "cluster", "nodes": "abc"},
+    {"name": None, "nodes": [{}]},
+    {"name": 42},
+    {"name": {"zh": "叢集", "en": "cluster"}},
+    {"name": ["cluster"], "nodes": [{"nodes": [{}, {}]}]},
+    {"name": "first", "nodes": [{}], "name2": "x"},
+    {"description": "沒有名稱與節點"},
+], ids=lambda content: json.dumps(content, ensure_ascii=False))
+def test_matches_full_parse(service, tmp_path, content):
+    """測試各種名稱與節點型別下，串流解析結果與完整解析相同"""
+    config_path = tmp_path / "cluster.json"
+    config_path.write_text(json.dumps(content, ensure_ascii=False), encoding="utf-8")
+
+    assert service._read_config_metadata(config_path) == _full_parse_metadata(config_path)
+
+
+def test_nodes_without_length_rejected(service, tmp_path):
+    """測試 nodes 為數字時與完整解析一樣拋出 TypeError"""
+    config_path = tmp_path / "cluster.json"
+    config_path.write_text(json.dumps({"name": "cluster", "nodes": 3}), encoding="utf-8")
+
+    with pytest.raises(TypeError):
+        service._read_config_metadata(config_path)
+
+
+def test_list_config_files_keeps_non_string_name(service, tmp_path):
+    """測試列表保留非字串名稱，缺少名稱時才使用檔名"""
+    (tmp_path / "numbered.json").write_text(json.dumps({"name": 7, "nodes": [{}]}), encoding="utf-8")
+    (tmp_path / "unnamed.json").write_text(json.dumps({"nodes": [{}, {}]}), encoding="utf-8")
+
+    files = {info["filename"]: info for info in service.list_config_files()}
+
+    assert files["numbered.json"]["config_name"] == 7
+    assert files["unnamed.json"]["config_name"] == "unnamed"
+    assert files["unnamed.json"]["node_count"] == 2
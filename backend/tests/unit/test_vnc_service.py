@@ -0,0 +1,268 @@
+"""
+VNCService 單元測試
+以 fakeredis（含 Lua 支援）執行 Token 建立、連線計數與撤銷腳本
+"""
+
+import asyncio
+
+import fakeredis
+import pytest
+from redis.crc import key_slot
+
+from src.services import vnc_service as vnc_module
+from src.services.vnc_service import VNCService
+
+
+@pytest.fixture
+def redis_client():
+    """每個測試各自使用獨立的 fakeredis 伺服器"""
+    return fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+
+@pytest.fixture
+def service(redis_client, monkeypatch):
+    monkeypatch.setattr(vnc_module, "get_async_redis", lambda: redis_client)
+    return VNCService()
+
+
+class TestCreateVNCToken:
+    """Token 建立腳本測試類別"""
+
+    async def test_create_token(self, service, redis_client):
+        """測試建立 Token 時一併寫入 Token 資料、連線計數與會話索引，且皆設定 TTL"""
+        result = await service.create_vnc_token("session-1", "vnc-container-1")
+
+        token = result["token"]
+        assert "session-1" not in token
+        assert result["vnc_url"] == f"/vnc/{token}"
+        assert result["max_connections"] == 1
+
+        token_hash = await redis_client.hgetall(vnc_module._token_key("session-1", token))
+        assert token_hash["session_id"] == "session-1"
+        assert token_hash["vnc_container_id"] == "vnc-container-1"
+        assert await redis_client.get(vnc_module._conn_key("session-1", token)) == "0"
+        assert token in await redis_client.get(vnc_module._index_key("session-1"))
+
+        for key in await redis_client.keys("*"):
+            assert 0 < await redis_client.ttl(key) <= service.token_timeout
+
+    async def test_token_key_layout(self, service, redis_client):
+        """測試會話 ID 只出現在 key 的 hash tag 中，Token 本身只有亂數部分"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+
+        assert vnc_module._token_key("session-1", token) == f"vnc_token:{{session-1}}:{token}"
+        assert await redis_client.exists(f"vnc_token:{{session-1}}:{token}")
+
+    async def test_keys_share_session_hash_tag(self, service, redis_client):
+        """測試同一會話的所有 key 帶有 {session_id} hash tag，落在同一個 Cluster slot"""
+        await service.create_vnc_token("session-1", "vnc-container-1")
+
+        keys = await redis_client.keys("*")
+        assert len(keys) == 3
+        assert all("{session-1}" in key for key in keys)
+        assert len({key_slot(key.encode()) for key in keys}) == 1
+
+    async def test_reuses_existing_token(self, service, redis_client):
+        """測試會話已有有效 Token 時回傳既有 Token，不再寫入新的 key"""
+        first = await service.create_vnc_token("session-1", "vnc-container-1")
+        second = await service.create_vnc_token("session-1", "vnc-container-1")
+
+        assert second == first
+        assert len(await redis_client.keys("*")) == 3
+
+    async def test_replaces_index_when_token_missing(self, service, redis_client):
+        """測試索引指向的 Token 已不存在時建立新 Token 並覆寫索引"""
+        first = await service.create_vnc_token("session-1", "vnc-container-1")
+        await redis_client.delete(vnc_module._token_key("session-1", first["token"]))
+
+        second = await service.create_vnc_token("session-1", "vnc-container-1")
+
+        assert second["token"] != first["token"]
+        assert second["token"] in await redis_client.get(vnc_module._index_key("session-1"))
+
+
+class TestValidateVNCToken:
+    """Token 驗證測試類別"""
+
+    async def test_validate_token(self, service):
+        """測試有效 Token 回傳資料與目前連線數"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+
+        token_data = await service.validate_vnc_token("session-1", token)
+
+        assert token_data["session_id"] == "session-1"
+        assert token_data["max_connections"] == 1
+        assert token_data["active_connections"] == 0
+
+    async def test_validate_unknown_token(self, service):
+        """測試不存在的 Token 無效"""
+        assert await service.validate_vnc_token("session-1", "unknown") is None
+
+    async def test_validate_rejects_token_of_other_session(self, service):
+        """測試 Token 搭配其他會話 ID 時無效"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+        await service.create_vnc_token("session-2", "vnc-container-2")
+
+        assert await service.validate_vnc_token("session-2", token) is None
+        assert await service.increment_connection("session-2", token) is False
+
+    async def test_validate_rejects_token_at_connection_cap(self, service):
+        """測試已達連線數上限的 Token 無效"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+        await service.increment_connection("session-1", token)
+
+        assert await service.validate_vnc_token("session-1", token) is None
+
+
+class TestConnectionCounter:
+    """連線計數腳本測試類別"""
+
+    async def test_increment_respects_cap(self, service, redis_client):
+        """測試連線數上限內才能增加連線"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+
+        assert await service.increment_connection("session-1", token) is True
+        assert await service.increment_connection("session-1", token) is False
+        assert await redis_client.get(vnc_module._conn_key("session-1", token)) == "1"
+
+    async def test_concurrent_increments_do_not_exceed_cap(self, service, redis_client):
+        """測試並發增加連線時計數不會遺失，也不會超過上限"""
+        service.max_connections_per_session = 5
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+
+        results = await asyncio.gather(*(service.increment_connection("session-1", token) for _ in range(10)))
+
+        assert results.count(True) == 5
+        assert await redis_client.get(vnc_module._conn_key("session-1", token)) == "5"
+
+    async def test_increment_unknown_token(self, service, redis_client):
+        """測試 Token 不存在時不增加連線，也不留下計數 key"""
+        assert await service.increment_connection("session-1", "unknown") is False
+        assert await redis_client.keys("*") == []
+
+    async def test_decrement(self, service, redis_client):
+        """測試減少連線計數"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+        await service.increment_connection("session-1", token)
+
+        assert await service.decrement_connection("session-1", token) is True
+        assert await redis_client.get(vnc_module._conn_key("session-1", token)) == "0"
+
+    async def test_decrement_clamps_at_zero(self, service, redis_client):
+        """測試連線數為 0 時減少連線仍為 0，且保留原本的 TTL"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+
+        assert await service.decrement_connection("session-1", token) is True
+        assert await redis_client.get(vnc_module._conn_key("session-1", token)) == "0"
+        assert await redis_client.ttl(vnc_module._conn_key("session-1", token)) > 0
+
+    async def test_decrement_unknown_token(self, service, redis_client):
+        """測試 Token 不存在時不減少連線"""
+        assert await service.decrement_connection("session-1", "unknown") is False
+        assert await redis_client.keys("*") == []
+
+    @pytest.mark.parametrize("method", ["increment_connection", "decrement_connection"])
+    async def test_rearms_missing_counter_ttl(self, service, redis_client, method):
+        """測試連線計數 key 遺失時，以 Token 的剩餘時間重建 TTL，不留下永久 key"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+        await redis_client.delete(vnc_module._conn_key("session-1", token))
+
+        assert await getattr(service, method)("session-1", token) is True
+
+        conn_ttl = await redis_client.pttl(vnc_module._conn_key("session-1", token))
+        assert 0 < conn_ttl <= await redis_client.pttl(vnc_module._token_key("session-1", token)) + 10
+
+    @pytest.mark.parametrize("method, expected", [
+        ("increment_connection", "1"),
+        ("decrement_connection", "0"),
+    ])
+    async def test_keeps_counter_when_token_has_no_ttl(self, service, redis_client, method, expected):
+        """測試 Token 沒有 TTL 時（PTTL 為 -1）不以負值 PEXPIRE 刪除剛重建的連線計數"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+        await redis_client.persist(vnc_module._token_key("session-1", token))
+        await redis_client.delete(vnc_module._conn_key("session-1", token))
+
+        assert await getattr(service, method)("session-1", token) is True
+
+        assert await redis_client.get(vnc_module._conn_key("session-1", token)) == expected
+
+
+class TestRevokeTokens:
+    """Token 撤銷測試類別"""
+
+    async def test_revoke_session_tokens(self, service, redis_client):
+        """測試撤銷會話 Token 會刪除所有 key 並清除行程內快取"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+        await service.validate_vnc_token("session-1", token)  # 寫入行程內快取
+
+        assert await service.revoke_session_tokens("session-1") is True
+
+        assert await redis_client.keys("*") == []
+        assert service._token_cache.get(vnc_module._token_key("session-1", token)) is None
+        assert await service.validate_vnc_token("session-1", token) is None
+
+    async def test_revoke_session_without_token(self, service):
+        """測試會話沒有 Token 時撤銷仍視為成功"""
+        assert await service.revoke_session_tokens("session-1") is True
+
+    async def test_cached_token_invalid_after_counter_removed(self, service, redis_client):
+        """測試行程內快取的 Token 在連線計數 key 消失（撤銷或過期）後即失效"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+        await service.validate_vnc_token("session-1", token)
+        await redis_client.delete(vnc_module._conn_key("session-1", token))
+
+        assert await service.validate_vnc_token("session-1", token) is None
+        assert service._token_cache.get(vnc_module._token_key("session-1", token)) is None
+
+    async def test_revoke_many(self, service, redis_client):
+        """測試批次撤銷只計算實際存在的 Token，其他會話的 key 不受影響"""
+        tokens = [
+            (await service.create_vnc_token(session_id, f"vnc-{session_id}"))["token"]
+            for session_id in ("session-1", "session-2", "session-3")
+        ]
+
+        revoked = await service.revoke_many(["session-1", "session-2", "session-missing"])
+
+        assert revoked == 2
+        assert await service.validate_vnc_token("session-1", tokens[0]) is None
+        assert await service.validate_vnc_token("session-2", tokens[1]) is None
+        assert await service.validate_vnc_token("session-3", tokens[2]) is not None
+        assert all("{session-3}" in key for key in await redis_client.keys("*"))
+
+    async def test_revoke_many_empty(self, service):
+        """測試空列表不送出任何指令"""
+        assert await service.revoke_many([]) == 0
+
+
+class TestTokenStats:
+    """Token 統計測試類別"""
+
+    async def test_get_token_stats(self, service):
+        """測試單一 Token 統計資訊"""
+        token = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+        await service.increment_connection("session-1", token)
+
+        stats = await service.get_token_stats("session-1", token)
+
+        assert stats["session_id"] == "session-1"
+        assert stats["active_connections"] == 1
+        assert stats["max_connections"] == 1
+
+    async def test_get_token_stats_bulk(self, service):
+        """測試批次統計只包含存在的 Token"""
+        first = (await service.create_vnc_token("session-1", "vnc-container-1"))["token"]
+        second = (await service.create_vnc_token("session-2", "vnc-container-2"))["token"]
+        await service.increment_connection("session-2", second)
+
+        stats = await service.get_token_stats_bulk([
+            ("session-1", first), ("session-2", second), ("session-3", "unknown")
+        ])
+
+        assert set(stats) == {first, second}
+        assert stats[first]["active_connections"] == 0
+        assert stats[second]["active_connections"] == 1
+        assert stats[second]["session_id"] == "session-2"
+
+    async def test_get_token_stats_bulk_empty(self, service):
+        """測試空列表回傳空結果"""
+        assert await service.get_token_stats_bulk([]) == {}
@@ -12,7 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.database.connection import create_tables, get_database
-from src.cache.redis_client import get_redis
+from src.cache.redis_client import connect_redis, get_redis
 from src.services.question_set_file_manager import QuestionSetFileManager
 from src.services.exam_session_service import ExamSessionService
 from src.services.environment_service import EnvironmentService
@@ -52,8 +52,8 @@ async def verify_redis():
     try:
         logger.info("=== 驗證 Redis 快取 ===")
 
+        success = connect_redis()
         redis_client = get_redis()
-        success = redis_client.connect()
 
         if success:
             # 測試基本操作